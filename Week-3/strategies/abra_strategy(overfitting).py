@@ -1,10 +1,12 @@
 from src.backtester import Order, OrderBook
 import pandas as pd
 from typing import List
+from collections import deque
 
 class Trader:
     def __init__(self):
-        self.price_history = []
+        # Longest windows are MACD(12, 26, 9) and the 30-tick z-score; 500 mids covers them
+        self.price_history = deque(maxlen=500)
         self.max_position = 50
         self.entry_price = None
         self.stop_loss = 100   
@@ -1,5 +1,6 @@
 from src.backtester import Order, OrderBook
 from typing import List
+from collections import deque
 import pandas as pd
 import numpy as np
 
@@ -8,7 +9,8 @@ class Trader:
         self.max_position = 50
         self.quote_size = 37 
         self.min_spread_threshold = 1 
-        self.price_history = []
+        # MACD(12, 26, 9), rolling(20) and RSI(14): 500 mids is plenty for the EMA-26
+        self.price_history = deque(maxlen=500)
 
     def run(self, state, current_position):
         orders: List[Order] = []
@@ -1,10 +1,12 @@
 from src.backtester import Order, OrderBook
 from typing import List
+from collections import deque
 import pandas as pd
 
 class Trader:
     def __init__(self):
-        self.price_history = []
+        # Bollinger(20) and MACD(12, 26, 9) need far fewer than 500 mids
+        self.price_history = deque(maxlen=500)
         self.max_position = 50
         self.quote_size = 15
         self.entry_price = None 
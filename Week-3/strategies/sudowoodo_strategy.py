@@ -1,10 +1,12 @@
 from src.backtester import Order, OrderBook
 from typing import List
+from collections import deque
 import pandas as pd
 
 class Trader:
     def __init__(self):
-        self.price_history = []
+        # rolling(20) plus the previous SMA value
+        self.price_history = deque(maxlen=21)
         self.max_position = 50
 
     def run(self, state, current_position):
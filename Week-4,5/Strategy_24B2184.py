@@ -1,57 +1,134 @@
 from AlgoTradingBacktester.src.backtester import Order, OrderBook
+from tradebotx.basket import BASKETS, BasketEngine
+from tradebotx.book import BookView
+from tradebotx.checkpoint import Checkpointer, load as load_checkpoint
+from tradebotx.events import EventDispatcher
+from tradebotx.fairvalue import FairValueEngine, OnlineFairValue
+from tradebotx.history import PriceHistory
+from tradebotx.indicators import MACD, RSI, RollingStats, WindowedMACD
+from tradebotx.orderbatch import ask_tick, bid_tick
+from tradebotx.pairs import PairsEngine
+from tradebotx.profiler import NULL_PROFILER, Profiler
+from tradebotx.risk import RiskEngine
+from tradebotx.snapshot import SnapshotHistory
+from tradebotx.tape import TapeEngine
+from tradebotx.tickstore import DATA_DIR
+from tradebotx.warmup import WARMUP_TICKS, prime_indicators, warm_up
 from typing import List
-import pandas as pd
-import numpy as np
-import statistics
 
 # Base Class
 class BaseClass:
-    def __init__(self, product_name, max_position):
+    # Event-driven strategies implement the on_* callbacks instead of get_orders
+    # and are only called when a subscribed book, their position or the trades changed
+    event_driven = False
+
+    def __init__(self, product_name, max_position, lookback=0):
         self.product_name = product_name
         self.max_position = max_position
+        self.lookback = lookback
+        # Only the last lookback + 1 mids are ever needed
+        self.prices = PriceHistory(lookback + 1)
+        self.profiler = NULL_PROFILER
+        # Set by Trader for index products: BasketEngine of the constituents
+        self.basket = None
+        # Set by Trader: PairSignals this product is a leg of
+        self.spreads = []
+        # Set by Trader: SnapshotHistory of all products, .latest is this tick's MarketSnapshot (no past ticks kept)
+        self.market = None
+        # Set by Trader(tape=True): TradeFeatures (VWAP, flow imbalance, intensity) of this product's market trades
+        self.tape = None
+        # Set by Trader(fair_values=True): FairValueEngine, depth-weighted microprices of every product this tick
+        self.fair_values = None
     
     def get_orders(self, state, orderbook, position):
-        """Override this method in product-specific strategies"""
+        """Override this method in product-specific strategies.
+        orderbook is a BookView: best_bid/best_ask/bid_volume/ask_volume are precomputed"""
+        return self.on_book_update(state, orderbook, position)
+
+    def subscriptions(self):
+        """Products whose book changes wake an event-driven strategy"""
+        return (self.product_name,)
+
+    def on_book_update(self, state, orderbook, position):
+        """Event-driven: orders for the new book (returning the same list again is fine)"""
         return []
 
+    def on_trade(self, state, trades):
+        """Event-driven: {product: trades} printed in subscribed products this tick"""
+
+    def on_fill(self, state, product, quantity):
+        """Event-driven: position moved by quantity since the last call"""
+
+    def fair_price(self, mid_price):
+        """Depth-weighted microprice to quote around; mid_price without a FairValueEngine"""
+        if self.fair_values is not None:
+            fair = self.fair_values.get(self.product_name)
+            if fair is not None:
+                return fair
+        return mid_price
+
+    def spread_zscore(self):
+        """Mean pairs z-score over the ready subscriptions (>0: this product is rich), 0 if none"""
+        scores = [pair.zscore_for(self.product_name) for pair in self.spreads if pair.ready]
+        return sum(scores) / len(scores) if scores else 0.0
+
+    def warm_up(self, mids):
+        """Startup: prime the price history and indicators with recorded mids before going live"""
+        prime_indicators(self, mids)
+
+    def configure(self, **params):
+        """Override tuning parameters after construction (used by parameter sweeps)"""
+        old_lookback = self.lookback
+        for name, value in params.items():
+            if not hasattr(self, name):
+                raise AttributeError(f"{type(self).__name__} has no parameter {name!r}")
+            setattr(self, name, value)
+        if self.lookback != old_lookback:
+            self.prices = PriceHistory(self.lookback + 1)
+            for name, value in list(vars(self).items()):
+                if isinstance(value, RollingStats) and value.window == old_lookback:
+                    setattr(self, name, RollingStats(self.lookback))
+                elif isinstance(value, WindowedMACD) and value.window == old_lookback:
+                    setattr(self, name, WindowedMACD(value.fast, value.slow, value.signal_span, self.lookback))
+        return self
+
 class AbraStrategy(BaseClass):
     def __init__(self):
-        super().__init__("ABRA", 50)
-        self.prices = []
-        self.lookback = 200
+        super().__init__("ABRA", 50, lookback=200)
         self.z_threshold = 2.0
         self.z_mm_threshold = 0.3
         self.skew_factor = 0.1
+        self.stats = RollingStats(self.lookback)
     def get_orders(self, state, orderbook, position):
         orders = []
 
         if not orderbook.buy_orders and not orderbook.sell_orders:
             return orders
 
-        best_ask = min(orderbook.sell_orders.keys()) if orderbook.sell_orders else None
-        best_bid = max(orderbook.buy_orders.keys()) if orderbook.buy_orders else None
+        best_ask = orderbook.best_ask
+        best_bid = orderbook.best_bid
         mid_price = (best_ask + best_bid) // 2
         self.prices.append(mid_price)
+        self.stats.update(mid_price)
+        self.profiler.lap("indicators")
 
         if len(self.prices) > self.lookback:
-            mean_price = statistics.mean(self.prices[-self.lookback:])
-            stddev_price = statistics.stdev(self.prices[-self.lookback:])
-            z_score = (mid_price - mean_price) / stddev_price
+            z_score = (mid_price - self.stats.mean) / self.stats.std
             if z_score > self.z_threshold:
                 orders.append(Order(self.product_name, best_bid, -7))
             elif z_score < -self.z_threshold:
                 orders.append(Order(self.product_name, best_ask, 7))
             elif abs(z_score) < self.z_mm_threshold:
-                return self.market_make(mid_price, position)
+                return self.market_make(self.fair_price(mid_price), position)
         elif len(self.prices) <= self.lookback:
-            return self.market_make(mid_price, position)
+            return self.market_make(self.fair_price(mid_price), position)
         return orders
 
     def market_make(self, mid_price, position):
         orders = []
         adjusted_mid_price = mid_price + self.skew_factor*position
-        orders.append(Order(self.product_name, adjusted_mid_price - 2, 7))
-        orders.append(Order(self.product_name, adjusted_mid_price + 2, -7))
+        orders.append(Order(self.product_name, bid_tick(adjusted_mid_price - 2), 7))
+        orders.append(Order(self.product_name, ask_tick(adjusted_mid_price + 2), -7))
         return orders
 
 class AshStrategy(BaseClass):
@@ -62,6 +139,7 @@ class AshStrategy(BaseClass):
         self.entry_price = None
         self.stop_loss_pct = 0.002 
         self.max_loss_per_trade=265 
+        self.basket_z = 2.0
 
     def get_orders(self, state, orderbook, position):
         orders = []
@@ -70,10 +148,10 @@ class AshStrategy(BaseClass):
         if not orderbook.buy_orders or not orderbook.sell_orders:
             return orders
 
-        best_bid = max(orderbook.buy_orders.keys())
-        best_ask = min(orderbook.sell_orders.keys())
-        bid_vol = orderbook.buy_orders[best_bid]
-        ask_vol = orderbook.sell_orders[best_ask]
+        best_bid = orderbook.best_bid
+        best_ask = orderbook.best_ask
+        bid_vol = orderbook.bid_volume
+        ask_vol = orderbook.ask_volume
         mid_price = (best_bid + best_ask) / 2
 
         if position == 0:
@@ -93,12 +171,18 @@ class AshStrategy(BaseClass):
                 self.entry_price = None
                 return orders
 
+        # Don't bid into a rich index or offer into a cheap one
+        rich = cheap = False
+        if self.basket is not None and self.basket.ready:
+            z = self.basket.zscore
+            rich, cheap = z > self.basket_z, z < -self.basket_z
+
         if best_ask - best_bid >= self.min_spread:
-            if position < self.max_position:
+            if position < self.max_position and not rich:
                 orders.append(Order(self.product_name, best_bid, min(self.value_size, bid_vol)))
                 if position == 0 and self.entry_price is None:
                     self.entry_price = best_bid  
-            if position > -self.max_position:
+            if position > -self.max_position and not cheap:
                 orders.append(Order(self.product_name, best_ask, -min(self.value_size, ask_vol)))
                 if position == 0 and self.entry_price is None:
                     self.entry_price = best_ask  
@@ -107,51 +191,51 @@ class AshStrategy(BaseClass):
 
 class DrowzeeStrategy(BaseClass):
     def __init__(self):
-        super().__init__("DROWZEE", 50)
-        self.lookback = 200
+        super().__init__("DROWZEE", 50, lookback=200)
         self.z_threshold = 3.75
-        self.prices = []
+        self.stats = RollingStats(self.lookback)
 
     def get_orders(self, state, orderbook, position):
         orders = []
         if not orderbook.buy_orders and not orderbook.sell_orders:
             return orders
 
-        best_ask = min(orderbook.sell_orders.keys()) if orderbook.sell_orders else None
-        best_bid = max(orderbook.buy_orders.keys()) if orderbook.buy_orders else None
+        best_ask = orderbook.best_ask
+        best_bid = orderbook.best_bid
         mid_price = (best_ask + best_bid) // 2
         self.prices.append(mid_price)
+        self.stats.update(mid_price)
+        self.profiler.lap("indicators")
 
         if len(self.prices) > self.lookback:
-            mean_price = statistics.mean(self.prices[-self.lookback:])
-            stddev_price = statistics.stdev(self.prices[-self.lookback:])
-            z_score = (mid_price - mean_price) / stddev_price
+            z_score = (mid_price - self.stats.mean) / self.stats.std
             if z_score > self.z_threshold:
                 orders.append(Order(self.product_name, best_bid, -self.max_position + position))
             elif z_score < -self.z_threshold:
                 orders.append(Order(self.product_name, best_ask, self.max_position - position))
             else:
-                return self.market_make(mid_price)
+                return self.market_make(self.fair_price(mid_price))
         elif len(self.prices) <= self.lookback:
-            return self.market_make(mid_price)
+            return self.market_make(self.fair_price(mid_price))
         return orders
 
     def market_make(self, mid_price):
         orders = []
-        orders.append(Order(self.product_name, mid_price - 1, 25))
-        orders.append(Order(self.product_name, mid_price + 1, -25))
+        orders.append(Order(self.product_name, bid_tick(mid_price - 1), 25))
+        orders.append(Order(self.product_name, ask_tick(mid_price + 1), -25))
         return orders
 
 class JolteonStrategy(BaseClass):
     def __init__(self):
-        super().__init__("JOLTEON", 350)
-        self.prices = []
-        self.lookback = 120
+        super().__init__("JOLTEON", 350, lookback=120)
         self.value_size = 5
         self.skew_factor = 0.2
         self.z_threshold = 1.8
         self.rsi_low = 35
         self.rsi_high = 65
+        self.pair_z = 2.0
+        self.stats = RollingStats(self.lookback)
+        self.rsi = RSI(14)
 
     def get_orders(self, state, orderbook, position):
         orders = []
@@ -159,32 +243,36 @@ class JolteonStrategy(BaseClass):
         if not orderbook.buy_orders or not orderbook.sell_orders:
             return orders
 
-        best_bid = max(orderbook.buy_orders)
-        best_ask = min(orderbook.sell_orders)
+        best_bid = orderbook.best_bid
+        best_ask = orderbook.best_ask
         mid_price = (best_bid + best_ask) // 2
         spread = best_ask - best_bid
         self.prices.append(mid_price)
+        self.stats.update(mid_price)
+        self.rsi.update(mid_price)
+        self.profiler.lap("indicators")
 
         if len(self.prices) <= self.lookback:
-            return self.market_make(mid_price, position, spread)
+            return self.market_make(self.fair_price(mid_price), position, spread)
 
-        prices = pd.Series(self.prices[-self.lookback:])
-        sma = prices.mean()
-        std = prices.std() or 1
+        sma = self.stats.mean
+        std = self.stats.std or 1
         z = (mid_price - sma) / std
 
         # RSI
-        delta = prices.diff().dropna()
-        up = delta.where(delta > 0, 0.0)
-        down = -delta.where(delta < 0, 0.0)
-        avg_gain = up.rolling(14).mean().iloc[-1]
-        avg_loss = down.rolling(14).mean().iloc[-1]
+        avg_gain = self.rsi.avg_gain
+        avg_loss = self.rsi.avg_loss
         rs = avg_gain / avg_loss if avg_loss != 0 else 0
         rsi = 100 - (100 / (1 + rs)) if rs != 0 else 50
 
+        # Don't buy while rich against LUXRAY/SHINX, or sell while cheap
+        pair_z = self.spread_zscore()
+
         # Entry/Exit signals
-        buy_signal = z < -self.z_threshold and rsi < self.rsi_low and position < self.max_position
-        sell_signal = z > self.z_threshold and rsi > self.rsi_high and position > -self.max_position
+        buy_signal = (z < -self.z_threshold and rsi < self.rsi_low and position < self.max_position
+                      and pair_z < self.pair_z)
+        sell_signal = (z > self.z_threshold and rsi > self.rsi_high and position > -self.max_position
+                       and pair_z > -self.pair_z)
 
         if buy_signal:
             qty = min(self.value_size, self.max_position - position)
@@ -195,7 +283,7 @@ class JolteonStrategy(BaseClass):
             orders.append(Order(self.product_name, best_bid, -qty))
 
         elif abs(z) < 0.25 and 45 < rsi < 55 and abs(position) < self.max_position * 0.8:
-            return self.market_make(mid_price, position, spread)
+            return self.market_make(self.fair_price(mid_price), position, spread)
 
         return orders
 
@@ -206,8 +294,8 @@ class JolteonStrategy(BaseClass):
             return orders
 
         skew = self.skew_factor * (position / self.max_position)
-        fair_bid = round(mid_price + skew - 1)
-        fair_ask = round(mid_price + skew + 1)
+        fair_bid = bid_tick(mid_price + skew - 1)
+        fair_ask = ask_tick(mid_price + skew + 1)
 
         if position < self.max_position:
             orders.append(Order(self.product_name, fair_bid, self.value_size))
@@ -218,12 +306,16 @@ class JolteonStrategy(BaseClass):
 
 class LuxrayStrategy(BaseClass):
     def __init__(self):
-        super().__init__("LUXRAY", 250)
-        self.prices = []
-        self.lookback = 50
+        super().__init__("LUXRAY", 250, lookback=50)
         self.skew_factor = 0.1
         self.value_size = 100
         self.entry_price = None  
+        self.stats = RollingStats(self.lookback)
+        self.sma10 = RollingStats(10)
+        self.sma20 = RollingStats(20)
+        # The 50 tick window is short enough that an EMA over the whole stream crosses elsewhere
+        self.macd = WindowedMACD(12, 26, 9, self.lookback)
+        self.rsi = RSI(14)
 
     def get_orders(self, state, orderbook, position):
         orders = []
@@ -231,51 +323,32 @@ class LuxrayStrategy(BaseClass):
         if not orderbook.buy_orders and not orderbook.sell_orders:
             return orders
 
-        best_ask = min(orderbook.sell_orders.keys()) if orderbook.sell_orders else None
-        best_bid = max(orderbook.buy_orders.keys()) if orderbook.buy_orders else None
+        best_ask = orderbook.best_ask
+        best_bid = orderbook.best_bid
         mid_price = (best_ask + best_bid) // 2
         spread = best_ask - best_bid
         self.prices.append(mid_price)
+        self.stats.update(mid_price)
+        self.sma10.update(mid_price)
+        self.sma20.update(mid_price)
+        self.macd.update(mid_price)
+        self.rsi.update(mid_price)
+        self.profiler.lap("indicators")
 
-
-  
         if len(self.prices) > self.lookback:
-            prices = pd.Series(self.prices[-self.lookback:])
-
-            sma = prices.rolling(self.lookback).mean().iloc[-1]
-            std = prices.rolling(self.lookback).std().iloc[-1]
-            sma10 = prices.rolling(10).mean().iloc[-1]
-            sma20 = prices.rolling(20).mean().iloc[-1]
+            sma10 = self.sma10.mean
+            sma20 = self.sma20.mean
             sma_trend_up = sma10 > sma20
             sma_trend_down = sma10 < sma20
             # MACD
-            ema_short = prices.ewm(span=12).mean()
-            ema_long = prices.ewm(span=26).mean()
-            macd_line = ema_short - ema_long
-            macd_signal_line = macd_line.ewm(span=9).mean()
-            macd_cross_up = (
-                macd_line.iloc[-2] < macd_signal_line.iloc[-2]
-                and macd_line.iloc[-1] > macd_signal_line.iloc[-1]
-            )
-            macd_cross_down = (
-                macd_line.iloc[-2] > macd_signal_line.iloc[-2]
-                and macd_line.iloc[-1] < macd_signal_line.iloc[-1]
-            )
+            macd_cross_up = self.macd.cross_up
+            macd_cross_down = self.macd.cross_down
 
             # Z-score
-            z_score = (mid_price - sma) / std if std != 0 else 0
+            z_score = self.stats.zscore(mid_price)
 
             # RSI
-            delta = prices.diff().dropna()
-            gains = delta.where(delta > 0, 0.0)
-            losses = (-delta).where(delta < 0, 0.0)
-            avg_gain = gains.rolling(14).mean().iloc[-1]
-            avg_loss = losses.rolling(14).mean().iloc[-1]
-            if avg_loss == 0 or np.isnan(avg_loss):
-                rsi = 100 if avg_gain > 0 else 50
-            else:
-                rs = avg_gain / avg_loss
-                rsi = 100 - (100 / (1 + rs)) if not np.isinf(rs) else 100
+            rsi = self.rsi.value
 
             # Combined Signal Logic
             buy_signal = (
@@ -293,9 +366,9 @@ class LuxrayStrategy(BaseClass):
             buy_price = mid_price - (spread *0.8)/ 2
             sell_price = mid_price + (spread*0.8) / 2
             if buy_signal or position + self.value_size <= self.max_position:
-                orders.append(Order(self.product_name, int(buy_price), self.max_position - position))
+                orders.append(Order(self.product_name, bid_tick(buy_price), self.max_position - position))
             elif sell_signal or position - self.value_size >= -self.max_position:
-                orders.append(Order(self.product_name, int(sell_price), -self.max_position + position))
+                orders.append(Order(self.product_name, ask_tick(sell_price), -self.max_position + position))
             elif no_signal:
                 return self.market_make(spread, mid_price, position)
             
@@ -308,20 +381,22 @@ class LuxrayStrategy(BaseClass):
         adjusted_mid_price = mid_price + self.skew_factor * position
         buy_price = adjusted_mid_price - (spread ) / 2
         sell_price = adjusted_mid_price + (spread) / 2
-        orders.append(Order(self.product_name, int(buy_price), self.value_size))
-        orders.append(Order(self.product_name, int(sell_price), -self.value_size))
+        orders.append(Order(self.product_name, bid_tick(buy_price), self.value_size))
+        orders.append(Order(self.product_name, ask_tick(sell_price), -self.value_size))
         return orders
     
 class MistyStrategy(BaseClass):
     def __init__(self):
-        super().__init__("MISTY", 100)
-        self.prices = []
-        self.lookback = 300
+        super().__init__("MISTY", 100, lookback=300)
         self.z_mm_threshold = 0.3
         self.skew_factor = 0.5
         self.value_size = 1
         self.entry_price = None
         self.per_unit_tp = 8
+        self.stats = RollingStats(self.lookback)
+        self.macd = MACD(12, 26, 9)
+        self.rsi = RSI(14)
+        self.basket_z = 2.0
 
 
     def get_orders(self, state, orderbook, position):
@@ -330,10 +405,14 @@ class MistyStrategy(BaseClass):
         if not orderbook.buy_orders or not orderbook.sell_orders:
             return orders
 
-        best_ask = min(orderbook.sell_orders.keys())
-        best_bid = max(orderbook.buy_orders.keys())
+        best_ask = orderbook.best_ask
+        best_bid = orderbook.best_bid
         mid_price = (best_ask + best_bid) // 2
         self.prices.append(mid_price)
+        self.stats.update(mid_price)
+        self.macd.update(mid_price)
+        self.rsi.update(mid_price)
+        self.profiler.lap("indicators")
 
         if position == 0:
             self.entry_price = None
@@ -352,50 +431,42 @@ class MistyStrategy(BaseClass):
                 return orders
 
         if len(self.prices) > self.lookback:
-            prices = pd.Series(self.prices[-self.lookback:])
-
             # Bollinger Bands
-            sma = prices.rolling(self.lookback).mean().iloc[-1]
-            std = prices.rolling(self.lookback).std().iloc[-1]
+            sma = self.stats.mean
+            std = self.stats.std
             upper = sma + 2 * std
             lower = sma - 2 * std
 
             # MACD
-            ema_short = prices.ewm(span=12).mean()
-            ema_long = prices.ewm(span=26).mean()
-            macd_line = ema_short - ema_long
-            macd_signal = macd_line.ewm(span=9).mean()
-            macd_cross_up = macd_line.iloc[-2] < macd_signal.iloc[-2] and macd_line.iloc[-1] > macd_signal.iloc[-1]
-            macd_cross_down = macd_line.iloc[-2] > macd_signal.iloc[-2] and macd_line.iloc[-1] < macd_signal.iloc[-1]
+            macd_cross_up = self.macd.cross_up
+            macd_cross_down = self.macd.cross_down
 
             # Z-score
-            z_score = (mid_price - sma) / std if std != 0 else 0
+            z_score = self.stats.zscore(mid_price)
 
             # RSI
-            delta = prices.diff().dropna()
-            gain = delta.where(delta > 0, 0.0)
-            loss = (-delta).where(delta < 0, 0.0)
-            avg_gain = gain.rolling(14).mean().iloc[-1]
-            avg_loss = loss.rolling(14).mean().iloc[-1]
-            if avg_loss == 0 or np.isnan(avg_loss):
-                rsi = 100 if avg_gain > 0 else 50
-            else:
-                rs = avg_gain / avg_loss
-                rsi = 100 - (100 / (1 + rs))
+            rsi = self.rsi.value
+
+            # Premium over the LUXRAY/JOLTEON basket
+            basket_z = 0.0
+            if self.basket is not None and self.basket.ready:
+                basket_z = self.basket.zscore
 
             # Signal logic
             buy_signal = sum([
                 macd_cross_up,
                 mid_price < lower,
                 rsi < 35,
-                z_score < -2.3
+                z_score < -2.3,
+                basket_z < -self.basket_z
             ]) >= 2
 
             sell_signal = sum([
                 macd_cross_down,
                 mid_price > upper,
                 rsi > 65,
-                z_score > 2.3
+                z_score > 2.3,
+                basket_z > self.basket_z
             ]) >= 2
 
             if buy_signal:
@@ -407,28 +478,30 @@ class MistyStrategy(BaseClass):
                 if self.entry_price is None:
                     self.entry_price = best_bid
             elif 45 < rsi < 55 and abs(z_score) < self.z_mm_threshold:
-                return self.market_make(mid_price, position)
+                return self.market_make(self.fair_price(mid_price), position)
         else:
-            return self.market_make(mid_price, position)
+            return self.market_make(self.fair_price(mid_price), position)
 
         return orders
 
     def market_make(self, mid_price, position):
         orders = []
         skewed_mid = mid_price + self.skew_factor * position
-        orders.append(Order(self.product_name, skewed_mid - 1, self.value_size))
-        orders.append(Order(self.product_name, skewed_mid + 1, -self.value_size))
+        orders.append(Order(self.product_name, bid_tick(skewed_mid - 1), self.value_size))
+        orders.append(Order(self.product_name, ask_tick(skewed_mid + 1), -self.value_size))
         return orders
 
 class ShinxStrategy(BaseClass):
     def __init__(self):
-        super().__init__("SHINX", 50)
-        self.prices = []
-        self.lookback = 200
+        super().__init__("SHINX", 50, lookback=200)
         self.z_threshold = 2.0
         self.z_mm_threshold = 0.3
         self.skew_factor = 0.1
         self.value_size = 5
+        self.pair_z = 2.0
+        self.stats = RollingStats(self.lookback)
+        self.macd = MACD(12, 26, 9)
+        self.rsi = RSI(14)
 
     def get_orders(self, state, orderbook, position):
         orders = []
@@ -436,53 +509,37 @@ class ShinxStrategy(BaseClass):
         if not orderbook.buy_orders and not orderbook.sell_orders:
             return orders
 
-        best_ask = min(orderbook.sell_orders.keys()) if orderbook.sell_orders else None
-        best_bid = max(orderbook.buy_orders.keys()) if orderbook.buy_orders else None
+        best_ask = orderbook.best_ask
+        best_bid = orderbook.best_bid
         mid_price = (best_ask + best_bid) // 2
         self.prices.append(mid_price)
+        self.stats.update(mid_price)
+        self.macd.update(mid_price)
+        self.rsi.update(mid_price)
+        self.profiler.lap("indicators")
 
         if len(self.prices) > self.lookback:
-            prices = pd.Series(self.prices[-self.lookback:])
-            sma = prices.rolling(self.lookback).mean().iloc[-1]
-            std = prices.rolling(self.lookback).std().iloc[-1]
-
             # MACD
-            ema_short = prices.ewm(span=12).mean()
-            ema_long = prices.ewm(span=26).mean()
-            macd_line = ema_short - ema_long
-            macd_signal_line = macd_line.ewm(span=9).mean()
-            macd_cross_up = (
-                macd_line.iloc[-2] < macd_signal_line.iloc[-2]
-                and macd_line.iloc[-1] > macd_signal_line.iloc[-1]
-            )
-            macd_cross_down = (
-                macd_line.iloc[-2] > macd_signal_line.iloc[-2]
-                and macd_line.iloc[-1] < macd_signal_line.iloc[-1]
-            )
+            macd_cross_up = self.macd.cross_up
+            macd_cross_down = self.macd.cross_down
 
             # Z-score
-            z_score = (mid_price - sma) / std if std != 0 else 0
+            z_score = self.stats.zscore(mid_price)
 
             # RSI
-            delta = prices.diff().dropna()
-            gains = delta.where(delta > 0, 0.0)
-            losses = (-delta).where(delta < 0, 0.0)
-            avg_gain = gains.rolling(14).mean().iloc[-1]
-            avg_loss = losses.rolling(14).mean().iloc[-1]
-            if avg_loss == 0 or np.isnan(avg_loss):
-                rsi = 100 if avg_gain > 0 else 50
-            else:
-                rs = avg_gain / avg_loss
-                rsi = 100 - (100 / (1 + rs)) if not np.isinf(rs) else 100
+            rsi = self.rsi.value
 
             
+            # Spread against LUXRAY/JOLTEON
+            pair_z = self.spread_zscore()
+
             buy_signal = (
                 (macd_cross_up)
-                and (rsi < 35 or z_score < -1.5) 
+                and (rsi < 35 or z_score < -1.5 or pair_z < -self.pair_z) 
             )
             sell_signal = (
                 (macd_cross_down)
-                and (rsi > 65 or z_score > 1.5)  
+                and (rsi > 65 or z_score > 1.5 or pair_z > self.pair_z)  
 
             )
           
@@ -491,38 +548,48 @@ class ShinxStrategy(BaseClass):
             elif sell_signal:
                 orders.append(Order(self.product_name, best_bid, -self.value_size))
             elif 45 < rsi < 55 and abs(z_score) < self.z_mm_threshold:
-                return self.market_make(mid_price, position)
+                return self.market_make(self.fair_price(mid_price), position)
         else:
-            return self.market_make(mid_price, position)
+            return self.market_make(self.fair_price(mid_price), position)
         return orders
 
     def market_make(self, mid_price, position):
         orders = []
         adjusted_mid_price = mid_price + self.skew_factor * position
-        orders.append(Order(self.product_name, adjusted_mid_price - 1 , self.value_size))
-        orders.append(Order(self.product_name, adjusted_mid_price + 1, -self.value_size))
+        orders.append(Order(self.product_name, bid_tick(adjusted_mid_price - 1), self.value_size))
+        orders.append(Order(self.product_name, ask_tick(adjusted_mid_price + 1), -self.value_size))
         return orders
     
 class SudowoodoStrategy(BaseClass): 
+    event_driven = True
 
     def __init__(self):
         super().__init__("SUDOWOODO", 50)
         self.fair_value = 10000
+        # With a FairValueEngine: online estimate of the level it trades around, starting from 10000
+        self.fair_estimate = OnlineFairValue(self.fair_value)
+        self.quotes = None
     
-    def get_orders(self, state, orderbook, position):
-        orders = []
-        
+    def on_book_update(self, state, orderbook, position):
         if not orderbook.buy_orders and not orderbook.sell_orders:
-            return orders
-
-        orders.append(Order(self.product_name, self.fair_value + 2, -10))
-        orders.append(Order(self.product_name, self.fair_value - 2, 10))
-
-        return orders
+            return []
+
+        if self.fair_values is not None:
+            fair = self.fair_values.get(self.product_name)
+            if fair is not None:
+                self.fair_value = round(self.fair_estimate.update(fair))
+
+        # Whole-tick levels: build the quotes once and resend them until the estimate moves
+        if self.quotes is None or self.quotes[0].price != self.fair_value + 2:
+            self.quotes = [Order(self.product_name, self.fair_value + 2, -10),
+                           Order(self.product_name, self.fair_value - 2, 10)]
+        return self.quotes
     
 class Trader:
     MAX_LIMIT = 0 # for single product mode only, don't remove
-    def __init__(self):
+    def __init__(self, profile=False, cprofile=False, workers=0, loss_limits=None,
+                 checkpoint_path=None, checkpoint_every=1000, fair_values=False,
+                 tape=False):
         self.strategies = {
             "ABRA": AbraStrategy(),
             "ASH": AshStrategy(),
@@ -533,15 +600,116 @@ class Trader:
             "SHINX": ShinxStrategy(),
             "SUDOWOODO": SudowoodoStrategy()
         }
+        # Per-product get_orders latency; a disabled profiler costs one attribute check
+        self.profiler = Profiler(cprofile=cprofile) if profile or cprofile else NULL_PROFILER
+        for strategy in self.strategies.values():
+            strategy.profiler = self.profiler
+        # Index fair values from the constituent books, updated once per tick
+        self.baskets = [BasketEngine(index, weights) for index, weights in BASKETS.items()
+                        if index in self.strategies]
+        for basket in self.baskets:
+            self.strategies[basket.index].basket = basket
+        # LUXRAY/JOLTEON/SHINX spreads, computed once and shared by both legs
+        self.pairs = PairsEngine()
+        for product, strategy in self.strategies.items():
+            strategy.spreads = self.pairs.subscriptions(product)
+        # One snapshot of every book per tick, shared by all strategies; only the latest is kept
+        self.market = SnapshotHistory(0, tuple(self.strategies))
+        for strategy in self.strategies.values():
+            strategy.market = self.market
+        # Opt-in rolling trade-tape features per product, fed from state.market_trades.
+        # No strategy reads them yet, and updating all eight products is work on every tick
+        self.tape = TapeEngine(tuple(self.strategies)) if tape and not workers else None
+        if self.tape is not None:
+            for product, strategy in self.strategies.items():
+                strategy.tape = self.tape.features[product]
+        # Opt-in: quote around microprice/depth-imbalance fair values instead of the integer mid.
+        # Off by default, it lost PnL on the replay data (422 against 2212 with the same fills)
+        self.fair_values = FairValueEngine(tuple(self.strategies)) if fair_values else None
+        for strategy in self.strategies.values():
+            strategy.fair_values = self.fair_values
+        self.events = EventDispatcher(self.strategies, self.profiler)
+        # Position, underlying-exposure and loss limits, checked for all products at once
+        self.risk = RiskEngine(tuple(self.strategies),
+                               {p: s.max_position for p, s in self.strategies.items()},
+                               loss_limits=loss_limits)
+        # workers > 0: strategies live in worker processes, one fixed set of products each
+        self.pool = None
+        if workers:
+            # multiprocessing is only imported by processes that use workers
+            from tradebotx.parallel import ProductWorkerPool
+            # Basket/pairs/fair-value signals are computed here and shipped; workers keep their own tape
+            self.pool = ProductWorkerPool({p: type(s) for p, s in self.strategies.items()}, workers, tape)
+        # Full state is saved every checkpoint_every ticks on a background thread
+        self.checkpointer = Checkpointer(checkpoint_path, checkpoint_every) if checkpoint_path else None
+
+    @classmethod
+    def from_checkpoint(cls, path, profile=False, checkpoint_path=None, checkpoint_every=1000):
+        """Resume from a checkpoint with warm histories and indicators"""
+        _, trader = load_checkpoint(path)
+        if profile:
+            trader.profiler = trader.events.profiler = Profiler()
+            for strategy in trader.strategies.values():
+                strategy.profiler = trader.profiler
+        if checkpoint_path:
+            trader.checkpointer = Checkpointer(checkpoint_path, checkpoint_every)
+        return trader
+
+    def warm_up(self, budget=0.5, ticks=WARMUP_TICKS, data_dir=DATA_DIR, before=None):
+        """Prime every strategy from the tail of its price file within budget seconds;
+        returns the products primed (the rest warm up on live ticks)"""
+        if self.pool is not None:
+            raise TypeError("strategies live in worker processes; warm up needs workers=0")
+        return warm_up(self.strategies, self.pairs, ticks, budget, data_dir, before, self.baskets)
+
+    def __getstate__(self):
+        if self.pool is not None:
+            raise TypeError("strategies live in worker processes; checkpoints need workers=0")
+        state = dict(self.__dict__)
+        state["checkpointer"] = None
+        return state
     
     def run(self, state):
-        result = {}
         positions = getattr(state, 'positions', {})
         if len(self.strategies) == 1: self.MAX_LIMIT= self.strategies["PRODUCT"].max_position # for single product mode only, don't remove
+        # Top of book is computed once here and shared with the strategies
+        books = {product: BookView.of(orderbook) for product, orderbook in state.order_depth.items()}
+        snapshot = self.market.build(getattr(state, 'timestamp', None), books, positions)
+        for basket in self.baskets:
+            basket.update(books)
+        self.pairs.update(books)
+        if self.fair_values is not None:
+            self.fair_values.update(books)
+        if self.pool is not None:
+            result = self.pool.run(state, self.worker_signals())
+        else:
+            if self.tape is not None:
+                self.tape.update(getattr(state, 'market_trades', None) or {}, books)
+            result = self.events.dispatch(state, books, positions)
 
-        for product, orderbook in state.order_depth.items():
-            current_position = positions.get(product, 0)
-            product_orders = self.strategies[product].get_orders(state, orderbook, current_position)
-            result[product] = product_orders
-        
+        result = self.risk.apply(result, positions, snapshot.mid)
+        if self.checkpointer is not None:
+            self.checkpointer.tick(self)
         return result, self.MAX_LIMIT
+
+    def worker_signals(self):
+        """This tick's shared signals as {product: {strategy attribute: frozen reading}} for pool workers"""
+        baskets = {basket.index: basket.reading() for basket in self.baskets}
+        pairs = {id(signal): signal.reading() for signal in self.pairs.signals}
+        signals = {}
+        for product, strategy in self.strategies.items():
+            attributes = {"spreads": [pairs[id(signal)] for signal in strategy.spreads]}
+            if product in baskets:
+                attributes["basket"] = baskets[product]
+            if self.fair_values is not None:
+                attributes["fair_values"] = {product: self.fair_values.get(product)}
+            signals[product] = attributes
+        return signals
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.close()
+            self.pool = None
+        if self.checkpointer is not None:
+            self.checkpointer.close()
+            self.checkpointer = None
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# tests import Strategy_24B2184 and tradebotx from the Week-4,5 directory
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
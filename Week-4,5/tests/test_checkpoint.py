@@ -0,0 +1,94 @@
+import pickle
+
+import numpy as np
+import pytest
+
+from tradebotx import checkpoint
+
+PRODUCTS = ("ABRA", "ASH", "DROWZEE", "JOLTEON", "LUXRAY", "MISTY", "SHINX", "SUDOWOODO")
+BASE = {"ABRA": 2000, "ASH": 58000, "DROWZEE": 5000, "JOLTEON": 7000,
+        "LUXRAY": 3000, "MISTY": 40000, "SHINX": 1000, "SUDOWOODO": 10000}
+
+
+class _State:
+    def __init__(self, timestamp, order_depth, positions):
+        self.timestamp = timestamp
+        self.order_depth = order_depth
+        self.positions = positions
+
+
+class _Book:
+    def __init__(self, buy_orders, sell_orders):
+        self.buy_orders = buy_orders
+        self.sell_orders = sell_orders
+
+
+def _states(ticks, seed=0):
+    rng = np.random.default_rng(seed)
+    mids = {product: price for product, price in BASE.items()}
+    for t in range(ticks):
+        depth = {}
+        for product in PRODUCTS:
+            mids[product] += int(rng.integers(-2, 3))
+            half = int(rng.integers(1, 4))
+            depth[product] = _Book({mids[product] - half - k: int(rng.integers(1, 30)) for k in range(3)},
+                                   {mids[product] + half + k: -int(rng.integers(1, 30)) for k in range(3)})
+        positions = {product: int(rng.integers(-20, 21)) for product in PRODUCTS}
+        yield _State(t * 100, depth, positions)
+
+
+def _orders(result):
+    return {product: [(o.price, o.quantity) for o in orders] for product, orders in result.items()}
+
+
+def test_restored_trader_continues_like_the_original(tmp_path):
+    from Strategy_24B2184 import Trader
+
+    path = str(tmp_path / "trader.ckpt")
+    states = list(_states(400))
+    trader = Trader(checkpoint_path=path, checkpoint_every=300)
+    for state in states[:300]:
+        trader.run(state)
+    trader.checkpointer.close()
+
+    restored = Trader.from_checkpoint(path)
+    for product, strategy in trader.strategies.items():
+        twin = restored.strategies[product]
+        assert twin.prices.window().tolist() == strategy.prices.window().tolist()
+        if hasattr(strategy, "stats"):
+            assert (twin.stats.mean, twin.stats.std) == (strategy.stats.mean, strategy.stats.std)
+        assert getattr(twin, "entry_price", None) == getattr(strategy, "entry_price", None)
+    luxray, twin = trader.strategies["LUXRAY"], restored.strategies["LUXRAY"]
+    assert (twin.macd.macd, twin.macd.signal, twin.rsi.value) == (luxray.macd.macd, luxray.macd.signal,
+                                                                  luxray.rsi.value)
+    assert restored.risk._last_position == trader.risk._last_position
+    assert restored.risk.pnl == trader.risk.pnl
+    # shared engines stay shared after the restore
+    assert restored.strategies["ASH"].basket is restored.baskets[0]
+
+    for state in states[300:]:
+        assert _orders(restored.run(state)[0]) == _orders(trader.run(state)[0])
+
+
+@pytest.mark.parametrize("damage", [lambda data: data[:10], lambda data: data[:len(data) // 2],
+                                    lambda data: b"NOTCKPT" + data[7:]])
+def test_truncated_or_foreign_files_are_rejected(tmp_path, damage):
+    path = tmp_path / "trader.ckpt"
+    checkpoint.write(str(path), 7, pickle.dumps(list(range(1000))))
+    assert checkpoint.load(str(path)) == (7, list(range(1000)))
+    path.write_bytes(damage(path.read_bytes()))
+    with pytest.raises(ValueError):
+        checkpoint.load(str(path))
+
+
+def test_failed_write_leaves_the_previous_checkpoint(tmp_path, monkeypatch):
+    path = str(tmp_path / "trader.ckpt")
+    checkpoint.write(path, 1, pickle.dumps({"tick": 1}))
+
+    def fail(fd):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(checkpoint.os, "fsync", fail)
+    with pytest.raises(OSError):
+        checkpoint.write(path, 2, pickle.dumps({"tick": 2}))
+    assert checkpoint.load(path) == (1, {"tick": 1})
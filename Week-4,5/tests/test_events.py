@@ -0,0 +1,52 @@
+from tradebotx.events import EventDispatcher
+
+
+class _State:
+    market_trades = {}
+
+
+class _Book:
+    def __init__(self, buy_orders, sell_orders):
+        self.buy_orders = buy_orders
+        self.sell_orders = sell_orders
+
+
+class _Strategy:
+    def __init__(self, event_driven):
+        self.event_driven = event_driven
+        self.calls = 0
+
+    def subscriptions(self):
+        return ("SUDOWOODO",)
+
+    def on_book_update(self, state, orderbook, position):
+        self.calls += 1
+        return [("order", max(orderbook.buy_orders), self.calls)]
+
+    def get_orders(self, state, orderbook, position):
+        return self.on_book_update(state, orderbook, position)
+
+
+def test_only_changed_books_wake_event_driven_strategies():
+    listener, classic = _Strategy(True), _Strategy(False)
+    dispatcher = EventDispatcher({"SUDOWOODO": listener, "ABRA": classic})
+    positions = {"SUDOWOODO": 0, "ABRA": 0}
+
+    def tick(bid):
+        books = {"SUDOWOODO": _Book({bid: 5}, {10002: -5}), "ABRA": _Book({1999: 5}, {2001: -5})}
+        return dispatcher.dispatch(_State(), books, positions)
+
+    first = tick(9998)
+    assert listener.calls == 1
+
+    # same book, same position, no trades: the cached orders go out and the strategy is not called
+    again = tick(9998)
+    assert listener.calls == 1
+    assert again["SUDOWOODO"] is first["SUDOWOODO"]
+    assert dispatcher.skipped == 1
+    assert classic.calls == 2
+
+    changed = tick(9999)
+    assert listener.calls == 2
+    assert changed["SUDOWOODO"] == [("order", 9999, 2)]
+    assert dispatcher.skipped == 1
@@ -0,0 +1,23 @@
+import pytest
+
+from tradebotx.book import BookView
+from tradebotx.fairvalue import FairValueEngine
+
+
+def test_negative_ask_volumes_stay_inside_the_book():
+    engine = FairValueEngine(("ASH",), levels=3)
+    engine.update({"ASH": BookView({100: 30, 99: 5}, {102: -10, 103: -40})})
+    fair = engine.get("ASH")
+    assert 100 < fair < 102
+    # heavier bid depth leans the fair value towards the ask
+    assert fair > 101
+
+
+def test_ordered_and_unordered_books_agree():
+    buy = {100: 30, 99: 5, 98: 7, 97: 1, 96: 50}
+    sell = {101: -10, 102: -40, 103: -2, 104: -9, 105: -3}
+    ordered, shuffled = FairValueEngine(("ASH",)), FairValueEngine(("ASH",))
+    ordered.update({"ASH": BookView.from_sorted(buy, sell)})
+    shuffled.update({"ASH": BookView(dict(reversed(buy.items())), dict(reversed(sell.items())))})
+    assert ordered.get("ASH") == pytest.approx(shuffled.get("ASH"))
+    assert ordered.imbalance == pytest.approx(shuffled.imbalance)
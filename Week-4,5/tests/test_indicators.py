@@ -0,0 +1,69 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from tradebotx.indicators import WindowedMACD
+from tradebotx.warmup import prime
+
+
+def _mids(ticks, seed=0):
+    """Integer mid-price random walk with flat stretches, like the recorded books."""
+    rng = np.random.default_rng(seed)
+    steps = rng.integers(-3, 4, ticks)
+    steps[rng.random(ticks) < 0.3] = 0
+    return (3000 + np.cumsum(steps)).tolist()
+
+
+def _pandas_indicators(window_prices, lookback):
+    """What the strategies computed from ``pd.Series(self.prices[-lookback:])`` before."""
+    prices = pd.Series(window_prices)
+    line = prices.ewm(span=12).mean() - prices.ewm(span=26).mean()
+    signal = line.ewm(span=9).mean()
+    delta = prices.diff()
+    gain = delta.where(delta > 0, 0).rolling(14).mean().iloc[-1]
+    loss = (-delta.where(delta < 0, 0)).rolling(14).mean().iloc[-1]
+    return {
+        "cross_up": line.iloc[-2] < signal.iloc[-2] and line.iloc[-1] > signal.iloc[-1],
+        "cross_down": line.iloc[-2] > signal.iloc[-2] and line.iloc[-1] < signal.iloc[-1],
+        "macd": line.iloc[-1], "signal": signal.iloc[-1],
+        "mean": prices.rolling(lookback).mean().iloc[-1], "std": prices.rolling(lookback).std().iloc[-1],
+        "rsi": 100 - 100 / (1 + gain / loss) if loss else (100 if gain > 0 else 50),
+    }
+
+
+@pytest.mark.parametrize("product", ["LUXRAY", "MISTY", "SHINX"])
+def test_strategy_indicators_match_pandas_over_their_window(product):
+    import Strategy_24B2184
+
+    strategy = Strategy_24B2184.Trader().strategies[product]
+    lookback = strategy.lookback
+    mids = _mids(lookback + 500, seed=lookback)
+    crosses = 0
+    for t, mid in enumerate(mids):
+        strategy.stats.update(mid)
+        strategy.macd.update(mid)
+        strategy.rsi.update(mid)
+        if t < lookback:
+            continue
+        expected = _pandas_indicators(mids[t - lookback + 1:t + 1], lookback)
+        assert (strategy.macd.cross_up, strategy.macd.cross_down) == (expected["cross_up"], expected["cross_down"])
+        crosses += expected["cross_up"] + expected["cross_down"]
+        # the streaming MACD of the 200/300 tick windows differs by the EWM tail past the window
+        assert strategy.macd.macd == pytest.approx(expected["macd"], abs=1e-4)
+        assert strategy.macd.signal == pytest.approx(expected["signal"], abs=1e-4)
+        assert strategy.stats.mean == pytest.approx(expected["mean"])
+        assert strategy.stats.std == pytest.approx(expected["std"])
+        assert strategy.rsi.value == pytest.approx(expected["rsi"])
+    assert crosses > 10
+
+
+def test_windowed_macd_warm_up_matches_streaming():
+    mids = _mids(300, seed=1)
+    live = WindowedMACD(12, 26, 9, 50)
+    for mid in mids:
+        live.update(mid)
+
+    primed = WindowedMACD(12, 26, 9, 50)
+    prime(primed, mids)
+    assert (primed.macd, primed.signal, primed.prev_macd, primed.prev_signal) == (
+        live.macd, live.signal, live.prev_macd, live.prev_signal)
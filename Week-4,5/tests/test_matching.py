@@ -0,0 +1,65 @@
+import numpy as np
+import pytest
+
+from tradebotx.matching import MatchingSimulator, load_trade_tables
+
+NAN = float("nan")
+
+
+def _book(rows):
+    """Columns of a one-product price table from ``(bids, asks)`` rows of ``[(price, volume), ...]``."""
+    columns = {"timestamp": np.arange(len(rows), dtype=np.int64) * 100}
+    for side, i in (("bid", 0), ("ask", 1)):
+        for k in range(1, 4):
+            levels = [row[i][k - 1] if k <= len(row[i]) else (NAN, NAN) for row in rows]
+            columns[f"{side}_price_{k}"] = np.array([p for p, _ in levels], dtype=np.float64)
+            columns[f"{side}_volume_{k}"] = np.array([v for _, v in levels], dtype=np.float64)
+    return columns
+
+
+def _trades(ticks):
+    """A trade table from ``(tick, price, quantity)``."""
+    return {"timestamp": np.array([t * 100 for t, _, _ in ticks], dtype=np.int64),
+            "price": np.array([p for _, p, _ in ticks], dtype=np.float64),
+            "quantity": np.array([q for _, _, q in ticks], dtype=np.float64)}
+
+
+class _Order:
+    def __init__(self, price, quantity):
+        self.price = price
+        self.quantity = quantity
+
+
+class _Trader:
+    def __init__(self, orders):
+        self.orders = orders
+        self.seen = []
+
+    def run(self, state):
+        book = state.order_depth["X"]
+        self.seen.append((book.best_ask, dict(book.sell_orders)))
+        return {"X": [_Order(p, q) for p, q in self.orders]}
+
+
+def test_own_fills_leave_the_traders_book_consistent():
+    rows = [([(99, 5)], [(101, 3), (102, 10)])] * 2
+    trader = _Trader([(101, 3)])
+    result = MatchingSimulator(trader, {"X": _book(rows)}, latency=1, limits={"X": 50}).run()
+    # the order sent on tick 0 arrives on tick 1 and lifts the 101 level of the simulator's copy only
+    assert result.positions["X"] == 3
+    assert trader.seen[1] == (101, {101: 3, 102: 10})
+
+
+def test_resent_order_keeps_only_its_remainder():
+    rows = [([(98, 5)], [(101, 5)])] * 3
+    trader = _Trader([(99, 10)])
+    result = MatchingSimulator(trader, {"X": _book(rows)}, {"X": _trades([(1, 99, 4), (2, 99, 100)])},
+                               limits={"X": 50}).run()
+    assert result.positions["X"] == 10
+
+
+def test_products_without_a_trade_tape_warn(tmp_path):
+    (tmp_path / "ABRA").mkdir()
+    (tmp_path / "ABRA" / "abra_price.csv").write_text("timestamp\n0\n")
+    with pytest.warns(UserWarning, match="ABRA"):
+        assert load_trade_tables(["ABRA"], str(tmp_path)) == {}
@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+
+from tradebotx.orderbatch import OrderBatch
+
+PRODUCTS = ("ABRA", "ASH", "DROWZEE", "JOLTEON", "LUXRAY", "MISTY", "SHINX", "SUDOWOODO")
+BASE = {"ABRA": 2000, "ASH": 58000, "DROWZEE": 5000, "JOLTEON": 7000,
+        "LUXRAY": 3000, "MISTY": 40000, "SHINX": 1000, "SUDOWOODO": 10000}
+
+
+class _State:
+    def __init__(self, timestamp, order_depth, positions):
+        self.timestamp = timestamp
+        self.order_depth = order_depth
+        self.positions = positions
+
+
+class _Book:
+    def __init__(self, buy_orders, sell_orders):
+        self.buy_orders = buy_orders
+        self.sell_orders = sell_orders
+
+
+def test_add_accepts_integral_floats():
+    batch = OrderBatch(("ASH",))
+    batch.add("ASH", np.float64(57981.0), 3.0)
+    batch.add("ASH", 57990, -2)
+    _, price, quantity = batch.columns()
+    assert price.tolist() == [57981, 57990]
+    assert quantity.tolist() == [3, -2]
+
+
+@pytest.mark.parametrize("price, quantity", [(57981.5, 1), (57981, 1.5), (float("nan"), 1)])
+def test_add_rejects_fractions(price, quantity):
+    with pytest.raises(TypeError):
+        OrderBatch(("ASH",)).add("ASH", price, quantity)
+
+
+def test_trader_runs_on_float_keyed_books():
+    from Strategy_24B2184 import Trader
+
+    rng = np.random.default_rng(0)
+    trader = Trader()
+    positions = dict.fromkeys(PRODUCTS, 0)
+    for t in range(600):
+        depth = {}
+        for product in PRODUCTS:
+            mid = BASE[product] + int(rng.integers(-3, 4)) + (40 if t > 400 and product == "ABRA" else 0)
+            half = int(rng.integers(1, 6))
+            depth[product] = _Book({np.float64(mid - half - k): float(rng.integers(1, 30)) for k in range(3)},
+                                   {np.float64(mid + half + k): -float(rng.integers(1, 30)) for k in range(3)})
+        result, _ = trader.run(_State(t * 100, depth, positions))
+        for orders in result.values():
+            for order in orders:
+                assert int(order.price) == order.price
+                assert int(order.quantity) == order.quantity
@@ -0,0 +1,22 @@
+from tradebotx.orders import OrderManager
+
+
+class _Order:
+    def __init__(self, symbol, price, quantity):
+        self.symbol = symbol
+        self.price = price
+        self.quantity = quantity
+
+
+def test_missing_products_get_their_quotes_cancelled():
+    manager = OrderManager()
+    bid, ask = _Order("ABRA", 1999, 5), _Order("ABRA", 2001, -5)
+    manager.reconcile_all({"ABRA": [bid, ask], "ASH": [_Order("ASH", 58000, 1)]})
+
+    result = manager.reconcile_all({"ASH": [_Order("ASH", 58000, 1)]})
+    assert result["ABRA"] == []
+    assert sorted((a.kind, a.product, a.old.price) for a in manager.actions) == [
+        ("cancel", "ABRA", 1999), ("cancel", "ABRA", 2001)]
+
+    manager.reconcile_all({"ASH": [_Order("ASH", 58000, 1)]})
+    assert manager.actions == []
@@ -0,0 +1,40 @@
+import numpy as np
+import pytest
+
+from tradebotx.pairs import PairSignal, cointegration
+
+
+def _prices(ticks=4000, beta=2.5, seed=0):
+    """``x`` and an independent ``z`` random walk, and ``y = 100 + beta * x`` plus AR(1) noise."""
+    rng = np.random.default_rng(seed)
+    x = 1000 + np.cumsum(rng.normal(0, 1, ticks))
+    z = 3000 + np.cumsum(rng.normal(0, 1, ticks))
+    noise = np.zeros(ticks)
+    for t in range(1, ticks):
+        noise[t] = 0.8 * noise[t - 1] + rng.normal(0, 2)
+    return x, 100 + beta * x + noise, z
+
+
+def test_online_hedge_ratio_converges_to_the_true_beta():
+    x, y, _ = _prices()
+    signal = PairSignal("Y", "X")
+    for y_price, x_price in zip(y.tolist(), x.tolist()):
+        signal.update(y_price, x_price)
+    assert signal.ready
+    assert signal.hedge_ratio == pytest.approx(2.5, abs=0.05)
+    # the spread is the noise, not the trend
+    assert abs(signal.spread) < 20
+
+
+def test_cointegration_separates_a_cointegrated_pair_from_random_walks():
+    # at 5% some independent walks look cointegrated by chance; this seed's do not
+    x, y, z = _prices(seed=2)
+    ranked = cointegration(np.column_stack((y, x, z)), ["Y", "X", "Z"])
+    assert {(row["y"], row["x"]) for row in ranked[:2]} == {("Y", "X"), ("X", "Y")}
+    rows = {(row["y"], row["x"]): row for row in ranked}
+    assert len(rows) == 6
+    assert rows["Y", "X"]["cointegrated"] and rows["X", "Y"]["cointegrated"]
+    assert rows["Y", "X"]["beta"] == pytest.approx(2.5, abs=0.01)
+    assert rows["Y", "X"]["half_life"] < 10
+    for pair in (("Y", "Z"), ("Z", "Y"), ("X", "Z"), ("Z", "X")):
+        assert not rows[pair]["cointegrated"]
@@ -0,0 +1,49 @@
+import numpy as np
+
+PRODUCTS = ("ABRA", "ASH", "DROWZEE", "JOLTEON", "LUXRAY", "MISTY", "SHINX", "SUDOWOODO")
+BASE = {"ABRA": 2000, "ASH": 58000, "DROWZEE": 5000, "JOLTEON": 7000,
+        "LUXRAY": 3000, "MISTY": 40000, "SHINX": 1000, "SUDOWOODO": 10000}
+
+
+class _State:
+    def __init__(self, timestamp, order_depth, positions):
+        self.timestamp = timestamp
+        self.order_depth = order_depth
+        self.positions = positions
+
+
+class _Book:
+    def __init__(self, buy_orders, sell_orders):
+        self.buy_orders = buy_orders
+        self.sell_orders = sell_orders
+
+
+def _replay(trader, ticks=450):
+    """Orders of every tick on a seeded random walk; positions follow the first order of each product."""
+    rng = np.random.default_rng(1)
+    mids = dict(BASE)
+    positions = dict.fromkeys(PRODUCTS, 0)
+    log = []
+    try:
+        for t in range(ticks):
+            depth = {}
+            for product in PRODUCTS:
+                mids[product] += int(rng.integers(-2, 3))
+                half = int(rng.integers(1, 4))
+                depth[product] = _Book({mids[product] - half - k: int(rng.integers(1, 30)) for k in range(3)},
+                                       {mids[product] + half + k: -int(rng.integers(1, 30)) for k in range(3)})
+            result, _ = trader.run(_State(t * 100, depth, dict(positions)))
+            log.append({p: [(o.price, o.quantity) for o in orders] for p, orders in result.items()})
+            for product, orders in result.items():
+                if orders:
+                    step = 1 if orders[0].quantity > 0 else -1
+                    positions[product] = max(-20, min(20, positions[product] + step))
+    finally:
+        trader.close()
+    return log
+
+
+def test_workers_match_serial_with_shared_signals():
+    from Strategy_24B2184 import Trader
+
+    assert _replay(Trader(fair_values=True, tape=True, workers=2)) == _replay(Trader(fair_values=True, tape=True))
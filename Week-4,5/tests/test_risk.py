@@ -0,0 +1,55 @@
+from tradebotx.risk import RiskEngine
+
+
+class _Order:
+    def __init__(self, symbol, price, quantity):
+        self.symbol = symbol
+        self.price = price
+        self.quantity = quantity
+
+
+def _sizes(result):
+    return {product: [(order.price, order.quantity) for order in orders] for product, orders in result.items()}
+
+
+def test_position_limit_clips_to_the_remaining_headroom_then_drops():
+    risk = RiskEngine(("ABRA",), {"ABRA": 50}, exposure_limits={})
+    result = {"ABRA": [_Order("ABRA", 1999, 6), _Order("ABRA", 1998, 6), _Order("ABRA", 1997, 5),
+                       _Order("ABRA", 2001, -20)]}
+
+    clipped = risk.apply(result, {"ABRA": 40}, [2000.0])
+    # 10 units of long room: the first bid fits, the second gets the last 4, the third none
+    assert _sizes(clipped) == {"ABRA": [(1999, 6), (1998, 4), (2001, -20)]}
+    assert [(price, requested, allowed, reason) for _, price, requested, allowed, reason in risk.clips] == [
+        (1998, 6, 4, "position_limit"), (1997, 5, 0, "position_limit")]
+
+    at_limit = risk.apply({"ABRA": [_Order("ABRA", 1999, 1), _Order("ABRA", 2001, -1)]}, {"ABRA": 50}, [2000.0])
+    assert _sizes(at_limit) == {"ABRA": [(2001, -1)]}
+    assert risk.counts["position_limit"] == 3
+
+
+def test_exposure_limit_scales_every_order_adding_to_an_underlying():
+    risk = RiskEngine(("ASH", "LUXRAY"), {"ASH": 100, "LUXRAY": 100},
+                      exposure_limits={"LUXRAY": 100}, baskets={"ASH": {"LUXRAY": 2}})
+    result = {"ASH": [_Order("ASH", 58000, 10)],
+              "LUXRAY": [_Order("LUXRAY", 3000, 10), _Order("LUXRAY", 3002, -10)]}
+
+    # 80 LUXRAY long, and the bids would add 10 + 2 * 10 = 30 against 20 of room: scaled by 2/3
+    clipped = risk.apply(result, {"LUXRAY": 80}, [58000.0, 3001.0])
+    assert _sizes(clipped) == {"ASH": [(58000, 6)], "LUXRAY": [(3000, 6), (3002, -10)]}
+    assert {reason for *_, reason in risk.clips} == {"exposure"}
+
+    # within the limit nothing is touched and the same result comes back
+    assert risk.apply(result, {"LUXRAY": 0}, [58000.0, 3001.0]) is result
+
+
+def test_loss_limit_only_lets_the_product_flatten():
+    risk = RiskEngine(("ABRA",), {"ABRA": 50}, exposure_limits={}, loss_limits={"ABRA": 100})
+    result = {"ABRA": [_Order("ABRA", 1999, 5), _Order("ABRA", 2001, -20)]}
+
+    assert risk.apply(result, {"ABRA": 10}, [2000.0]) is result
+    # 10 long through a 20 tick drop: -200 marked PnL, past the 100 loss limit
+    stopped = risk.apply(result, {"ABRA": 10}, [1980.0])
+    assert risk.report()["pnl"]["ABRA"] == -200
+    assert _sizes(stopped) == {"ABRA": [(2001, -10)]}
+    assert {reason for *_, reason in risk.clips} == {"loss_limit"}
@@ -0,0 +1,50 @@
+import numpy as np
+import pytest
+
+from tradebotx import shards, tickstore, warmup
+from tradebotx.backtest import Backtester
+
+BASE = {"ABRA": 2000, "ASH": 58000, "DROWZEE": 5000, "JOLTEON": 7000,
+        "LUXRAY": 3000, "MISTY": 40000, "SHINX": 1000, "SUDOWOODO": 10000}
+
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    """Random-walk price files for every product, converted into a store under ``tmp_path``."""
+    rng = np.random.default_rng(0)
+    ticks = 1500
+    for product, price in BASE.items():
+        mid = price + np.cumsum(rng.integers(-2, 3, ticks))
+        half = rng.integers(1, 4, ticks)
+        lines = [",".join(tickstore.BOOK_COLUMNS)]
+        for t in range(ticks):
+            volumes = rng.integers(1, 30, 6)
+            bids = [(mid[t] - half[t] - k, volumes[k]) for k in range(3)]
+            asks = [(mid[t] + half[t] + k, volumes[3 + k]) for k in range(3)]
+            row = [t * 100] + [level[part] for side in (bids, asks) for part in (0, 1) for level in side]
+            lines.append(",".join(map(str, row)))
+        (tmp_path / product).mkdir()
+        (tmp_path / product / f"{product.lower()}_price.csv").write_text("\n".join(lines) + "\n")
+
+    store = str(tmp_path / "store")
+
+    def load_prices(product, data_dir=tickstore.DATA_DIR, store_dir=store):
+        return tickstore.load(product, "price", data_dir, store)
+
+    monkeypatch.setattr(tickstore, "load_prices", load_prices)
+    monkeypatch.setattr(warmup, "load_prices", load_prices)
+    return str(tmp_path)
+
+
+def test_first_shard_reproduces_the_sequential_curve(data_dir):
+    from Strategy_24B2184 import Trader
+
+    trader = Trader()
+    sequential = Backtester(trader, tickstore.load_all(data_dir=data_dir)).run()
+    trader.close()
+    result = shards.replay(Trader, data_dir=data_dir, shards=3, workers=1)
+
+    assert len(result.boundaries) == 2
+    first = int(np.searchsorted(result.timestamps, result.boundaries[0]))
+    assert np.array_equal(result.timestamps, sequential.timestamps)
+    assert np.max(np.abs(result.pnl_curve[:first] - sequential.pnl_curve[:first])) == 0.0
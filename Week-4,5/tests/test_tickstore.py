@@ -0,0 +1,34 @@
+import os
+
+from tradebotx import tickstore
+
+
+def _write_prices(data_dir, product, base):
+    lines = [",".join(tickstore.BOOK_COLUMNS)]
+    for t in range(5):
+        row = [t * 100] + [base - 1, base - 2, base - 3, 10, 10, 10, base + 1, base + 2, base + 3, 10, 10, 10]
+        lines.append(",".join(map(str, row)))
+    (data_dir / product).mkdir(parents=True)
+    (data_dir / product / f"{product.lower()}_price.csv").write_text("\n".join(lines) + "\n")
+
+
+def test_data_sets_do_not_share_store_entries(tmp_path):
+    store = str(tmp_path / "store")
+    _write_prices(tmp_path / "day1", "ABRA", 2000)
+    _write_prices(tmp_path / "day2", "ABRA", 3000)
+
+    day1 = tickstore.load_prices("ABRA", str(tmp_path / "day1"), store)
+    day2 = tickstore.load_prices("ABRA", str(tmp_path / "day2"), store)
+    assert day1["bid_price_1"][0] == 1999
+    assert day2["bid_price_1"][0] == 2999
+    # the first set is still fresh and was not overwritten by the second
+    assert tickstore.load_prices("ABRA", str(tmp_path / "day1"), store)["bid_price_1"][0] == 1999
+    leftovers = [name for _, _, files in os.walk(store) for name in files if name.endswith(".tmp")]
+    assert leftovers == []
+
+
+def test_trade_tapes_are_found_in_the_data_root(tmp_path):
+    _write_prices(tmp_path, "DROWZEE", 5000)
+    (tmp_path / "drowzee_trades.csv").write_text("timestamp,price,quantity\n0,5000,1\n")
+    assert tickstore.find_data_file("DROWZEE", "trade", str(tmp_path)) == str(tmp_path / "drowzee_trades.csv")
+    assert tickstore.find_data_file("DROWZEE", "price", str(tmp_path)).endswith("drowzee_price.csv")
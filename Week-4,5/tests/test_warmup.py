@@ -0,0 +1,42 @@
+import numpy as np
+
+from tradebotx.basket import BASKETS, BasketEngine
+from tradebotx.book import BookView
+from tradebotx.warmup import prime_basket
+
+
+def _tails(ticks=400, seed=0):
+    """Top-of-book price columns of ASH and its legs; LUXRAY misses every 7th timestamp."""
+    rng = np.random.default_rng(seed)
+    base = {"ASH": 58000, "LUXRAY": 3000, "JOLTEON": 7000, "SHINX": 1000}
+    tails = {}
+    for product, price in base.items():
+        timestamps = np.arange(ticks, dtype=np.int64) * 100
+        if product == "LUXRAY":
+            timestamps = timestamps[np.arange(ticks) % 7 != 3]
+        mid = price + np.cumsum(rng.integers(-2, 3, len(timestamps)))
+        half = rng.integers(1, 4, len(timestamps))
+        bid = (mid - half).astype(np.float64)
+        bid[5] = np.nan
+        tails[product] = {"timestamp": timestamps, "bid_price_1": bid, "ask_price_1": (mid + half).astype(np.float64)}
+    return tails
+
+
+def test_prime_basket_matches_live_updates():
+    tails = _tails()
+    live = BasketEngine("ASH", BASKETS["ASH"])
+    for timestamp in range(0, 400 * 100, 100):
+        books = {}
+        for product, table in tails.items():
+            row = np.searchsorted(table["timestamp"], timestamp)
+            if row < len(table["timestamp"]) and table["timestamp"][row] == timestamp:
+                bid, ask = table["bid_price_1"][row], table["ask_price_1"][row]
+                books[product] = BookView({} if np.isnan(bid) else {int(bid): 1}, {int(ask): 1})
+        live.update(books)
+
+    primed = BasketEngine("ASH", BASKETS["ASH"])
+    prime_basket(primed, tails)
+    assert primed.ready and live.ready
+    assert (primed.synthetic_bid, primed.synthetic_ask, primed.premium) == (live.synthetic_bid, live.synthetic_ask,
+                                                                          live.premium)
+    assert primed.zscore == live.zscore
@@ -0,0 +1 @@
+"""Shared building blocks for the Week-4,5 trading strategies."""
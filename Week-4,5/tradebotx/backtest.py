@@ -0,0 +1,215 @@
+"""Tick-replay backtester for the Week-4,5 strategies.
+
+Replays the recorded order books (via ``tradebotx.tickstore``) through a
+``Trader`` (or a single strategy) and tracks positions, cash and PnL.  Orders
+only fill against the visible book of the tick they were sent on; anything
+that does not cross is dropped at the end of the tick.
+"""
+import math
+
+import numpy as np
+
+from tradebotx.book import BookView
+from tradebotx.events import EventDispatcher
+from tradebotx.profiler import NULL_PROFILER
+from tradebotx.tickstore import DATA_DIR, LEVELS, PRODUCTS, load_all
+
+
+class State:
+    __slots__ = ("timestamp", "order_depth", "positions")
+
+    def __init__(self, timestamp, order_depth, positions):
+        self.timestamp = timestamp
+        self.order_depth = order_depth
+        self.positions = positions
+
+
+class StrategyTrader:
+    """Runs a subset of ``BaseClass`` strategies the way ``Trader.run`` runs all of them."""
+
+    def __init__(self, *strategies):
+        self.strategies = {strategy.product_name: strategy for strategy in strategies}
+        # strategies taken from a Trader share its profiler
+        self.events = EventDispatcher(self.strategies, strategies[0].profiler if strategies else NULL_PROFILER)
+
+    def run(self, state):
+        books = {product: BookView.of(orderbook) for product, orderbook in state.order_depth.items()}
+        return self.events.dispatch(state, books, state.positions)
+
+
+class BacktestResult:
+    def __init__(self, timestamps, pnl_curve, positions, cash, turnover, fills):
+        self.timestamps = timestamps
+        self.pnl_curve = pnl_curve
+        self.positions = positions
+        self.cash = cash
+        self.turnover = turnover
+        self.fills = fills
+
+    @property
+    def pnl(self):
+        return float(self.pnl_curve[-1]) if len(self.pnl_curve) else 0.0
+
+    @property
+    def max_drawdown(self):
+        if not len(self.pnl_curve):
+            return 0.0
+        return float(np.max(np.maximum.accumulate(self.pnl_curve) - self.pnl_curve))
+
+    def summary(self):
+        return {"pnl": self.pnl, "max_drawdown": self.max_drawdown,
+                "turnover": self.turnover, "fills": self.fills}
+
+
+def level_dicts(columns, side):
+    """Per-row ``{price: volume}`` dicts for one side of the book, best level first."""
+    prices = np.stack([columns[f"{side}_price_{k}"] for k in range(1, LEVELS + 1)], axis=1)
+    volumes = np.stack([columns[f"{side}_volume_{k}"] for k in range(1, LEVELS + 1)], axis=1)
+    valid = ~np.isnan(prices)
+    prices = np.where(valid, prices, 0).astype(np.int64).tolist()
+    volumes = np.abs(np.where(valid, volumes, 0)).astype(np.int64).tolist()
+    valid = valid.tolist()
+    return [
+        {p: v for p, v, ok in zip(pr, vo, va) if ok}
+        for pr, vo, va in zip(prices, volumes, valid)
+    ]
+
+
+def mids_for_indicators(columns):
+    """The ``(best_ask + best_bid) // 2`` mids the strategies feed their indicators."""
+    bid, ask = columns["bid_price_1"], columns["ask_price_1"]
+    both = ~np.isnan(bid) & ~np.isnan(ask)
+    return np.floor((bid[both] + ask[both]) / 2)
+
+
+class Backtester:
+    def __init__(self, trader, data, limits=None):
+        self.trader = trader
+        self.data = data
+        self.limits = dict(limits or {})
+        strategies = getattr(trader, "strategies", {})
+        for product in data:
+            if product not in self.limits and product in strategies:
+                self.limits[product] = strategies[product].max_position
+
+    def _timeline(self):
+        """Union of timestamps and, per product, the row shown at each of them (-1 if none)."""
+        timestamps = np.unique(np.concatenate([cols["timestamp"] for cols in self.data.values()]))
+        rows = {}
+        for product, cols in self.data.items():
+            ts = cols["timestamp"]
+            idx = np.searchsorted(ts, timestamps)
+            hit = (idx < len(ts)) & (ts[np.minimum(idx, len(ts) - 1)] == timestamps)
+            rows[product] = np.where(hit, idx, -1).tolist()
+        return timestamps, rows
+
+    def run(self):
+        timestamps, rows = self._timeline()
+        products = list(self.data)
+        books = {}
+        mids = {}
+        for product in products:
+            cols = self.data[product]
+            books[product] = (level_dicts(cols, "bid"), level_dicts(cols, "ask"))
+            mids[product] = ((cols["bid_price_1"] + cols["ask_price_1"]) / 2).tolist()
+
+        positions = {product: 0 for product in products}
+        cash = 0.0
+        turnover = 0
+        fills = 0
+        last_mid = {}
+        pnl_curve = np.empty(len(timestamps))
+
+        for t, timestamp in enumerate(timestamps.tolist()):
+            order_depth = {}
+            for product in products:
+                row = rows[product][t]
+                if row < 0:
+                    continue
+                bids, asks = books[product]
+                order_depth[product] = BookView.from_sorted(dict(bids[row]), dict(asks[row]))
+                if not math.isnan(mids[product][row]):
+                    last_mid[product] = mids[product][row]
+
+            output = self.trader.run(State(timestamp, order_depth, dict(positions)))
+            result = output[0] if isinstance(output, tuple) else output
+
+            for product, orders in result.items():
+                book = order_depth.get(product)
+                if book is None:
+                    continue
+                limit = self.limits.get(product, math.inf)
+                for order in orders:
+                    filled, notional = _match(order, book, positions[product], limit)
+                    if filled:
+                        positions[product] += filled
+                        cash -= notional
+                        turnover += abs(filled)
+                        fills += 1
+
+            pnl_curve[t] = cash + sum(positions[p] * last_mid.get(p, 0.0) for p in products)
+
+        return BacktestResult(timestamps, pnl_curve, positions, cash, turnover, fills)
+
+
+def _match(order, book, position, limit):
+    """Fill ``order`` against the visible levels of ``book``; returns (quantity, notional)."""
+    qty = order.quantity
+    if qty > 0:
+        room = min(qty, limit - position)
+        levels = book.sell_orders
+        crossing = sorted(p for p in levels if p <= order.price)
+    else:
+        room = min(-qty, limit + position)
+        levels = book.buy_orders
+        crossing = sorted((p for p in levels if p >= order.price), reverse=True)
+    filled = 0
+    notional = 0.0
+    for price in crossing:
+        if room <= 0:
+            break
+        take = min(room, levels[price])
+        room -= take
+        filled += take
+        notional += take * price
+        levels[price] -= take
+        if not levels[price]:
+            del levels[price]
+    if qty < 0:
+        return -filled, -notional
+    return filled, notional
+
+
+def main(argv=None):
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description="Replay recorded books through the strategies")
+    parser.add_argument("products", nargs="*", default=list(PRODUCTS))
+    parser.add_argument("--data-dir", default=DATA_DIR)
+    parser.add_argument("--profile", action="store_true", help="print get_orders latency histograms")
+    parser.add_argument("--cprofile", metavar="PATH", help="also dump cProfile stats to PATH")
+    args = parser.parse_args(argv)
+
+    from Strategy_24B2184 import Trader
+
+    data = load_all(args.products, args.data_dir)
+    trader = Trader(profile=args.profile, cprofile=bool(args.cprofile))
+    profiler = trader.profiler
+    if set(data) != set(trader.strategies):
+        trader = StrategyTrader(*(s for p, s in trader.strategies.items() if p in data))
+    start = time.perf_counter()
+    result = Backtester(trader, data).run()
+    elapsed = time.perf_counter() - start
+    print(f"{len(result.timestamps)} ticks in {elapsed:.2f}s")
+    for key, value in result.summary().items():
+        print(f"{key:>13}: {value}")
+    print(f"    positions: {result.positions}")
+    if profiler.enabled:
+        print(profiler.report())
+    if args.cprofile:
+        profiler.dump(args.cprofile)
+
+
+if __name__ == "__main__":
+    main()
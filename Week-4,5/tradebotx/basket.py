@@ -0,0 +1,101 @@
+"""Synthetic fair value for the ASH and MISTY indices from their constituents.
+
+Ash Index = 6 LUXRAY + 3 JOLTEON + 1 SHINX and Misty Index = 4 LUXRAY +
+2 JOLTEON.  ``BasketEngine`` keeps the synthetic bid/ask of the weighted
+constituent books as running sums, adjusting only the legs whose top of book
+moved this tick, and tracks the index's premium over the synthetic mid with
+streaming statistics.  Prices are integers, so the running sums never drift.
+
+``BasketEngine.reading`` freezes this tick's outputs into a ``BasketReading``
+with the same attributes, which is what strategies in worker processes get.
+"""
+from tradebotx.indicators import RollingStats
+
+BASKETS = {
+    "ASH": {"LUXRAY": 6, "JOLTEON": 3, "SHINX": 1},
+    "MISTY": {"LUXRAY": 4, "JOLTEON": 2},
+}
+
+
+class BasketReading:
+    """One tick's outputs of a ``BasketEngine``; ``fair_value`` and ``zscore`` are ``None`` until ready."""
+    __slots__ = ("index", "ready", "premium", "synthetic_mid", "fair_value", "zscore")
+
+    def __init__(self, index, ready, premium, synthetic_mid, fair_value, zscore):
+        self.index = index
+        self.ready = ready
+        self.premium = premium
+        self.synthetic_mid = synthetic_mid
+        self.fair_value = fair_value
+        self.zscore = zscore
+
+
+class BasketEngine:
+    def __init__(self, index, weights, window=200):
+        self.index = index
+        self.weights = dict(weights)
+        self.window = window
+        self.premium_stats = RollingStats(window)
+        self.synthetic_bid = 0
+        self.synthetic_ask = 0
+        self.premium = None
+        self.index_mid = None
+        self._tops = {leg: None for leg in self.weights}
+        self._missing = len(self.weights)
+        self.legs_changed = 0
+
+    def _update_leg(self, leg, book):
+        top = (book.best_bid, book.best_ask)
+        old = self._tops[leg]
+        if top == old or None in top:
+            return False
+        weight = self.weights[leg]
+        if old is None:
+            self._missing -= 1
+        else:
+            self.synthetic_bid -= weight * old[0]
+            self.synthetic_ask -= weight * old[1]
+        self.synthetic_bid += weight * top[0]
+        self.synthetic_ask += weight * top[1]
+        self._tops[leg] = top
+        return True
+
+    def update(self, books):
+        """Refresh from this tick's ``{product: BookView}``; unchanged legs cost one comparison."""
+        self.legs_changed = 0
+        for leg in self.weights:
+            book = books.get(leg)
+            if book is not None and self._update_leg(leg, book):
+                self.legs_changed += 1
+        if self._missing:
+            return
+        index_book = books.get(self.index)
+        if index_book is not None and index_book.mid is not None:
+            self.index_mid = index_book.mid
+        if self.index_mid is None:
+            return
+        self.premium = self.index_mid - self.synthetic_mid
+        self.premium_stats.update(self.premium)
+
+    @property
+    def synthetic_mid(self):
+        return (self.synthetic_bid + self.synthetic_ask) / 2
+
+    @property
+    def ready(self):
+        return not self._missing and self.premium_stats.full
+
+    @property
+    def fair_value(self):
+        """Synthetic mid shifted by the usual premium: where the index "should" trade."""
+        return self.synthetic_mid + self.premium_stats.mean
+
+    @property
+    def zscore(self):
+        """How rich (>0) or cheap (<0) the index is versus its usual premium."""
+        return self.premium_stats.zscore(self.premium)
+
+    def reading(self):
+        ready = self.ready
+        return BasketReading(self.index, ready, self.premium, None if self._missing else self.synthetic_mid,
+                             self.fair_value if ready else None, self.zscore if ready else None)
@@ -0,0 +1,303 @@
+"""Benchmarks for the strategies and indicators, with regression checks.
+
+``run`` replays a tick stream (synthetic by default, or the recorded books
+with ``--data-dir``) through every strategy on its own and through
+``Trader.run`` as a whole, measuring ticks/second, per-tick latency
+percentiles and peak traced memory, and micro-benchmarks each indicator.
+``startup`` times ``import Strategy_24B2184`` in fresh interpreters and
+records their resident memory: every sweep worker and every restart pays
+it before the first tick, so the strategy runtime must not pull in pandas
+(or anything else in ``HEAVY_MODULES``); only the analysis code imports
+pandas, lazily.
+Results are written as JSON; ``compare`` diffs two such files and exits
+non-zero when any metric regressed by more than the threshold.
+
+    python -m tradebotx.bench run --out baseline.json
+    python -m tradebotx.bench run --out current.json
+    python -m tradebotx.bench compare baseline.json current.json --threshold 0.1
+    python -m tradebotx.bench startup
+"""
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from tradebotx.book import BookView
+from tradebotx.indicators import EMA, MACD, RSI, RollingStats
+from tradebotx.profiler import LatencyHistogram
+from tradebotx.tickstore import PRODUCTS
+
+# metric -> True when bigger is better
+METRICS = {"ticks_per_sec": True, "p50_us": False, "p99_us": False, "peak_kb": False,
+           "import_ms": False, "process_ms": False, "rss_kb": False}
+
+# modules the strategy runtime must not import
+HEAVY_MODULES = ("pandas", "scipy", "matplotlib", "statsmodels")
+
+# ru_maxrss survives exec, so a child forked from this (larger) process would report our peak;
+# VmHWM belongs to the child's own address space.  ru_maxrss is the fallback without /proc
+_STARTUP_SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+import Strategy_24B2184
+import_ms = (time.perf_counter() - start) * 1e3
+try:
+    with open("/proc/self/status") as status:
+        rss_kb = next(int(line.split()[1]) for line in status if line.startswith("VmHWM:"))
+except (OSError, StopIteration):
+    import resource
+    rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(json.dumps({"import_ms": import_ms,
+                  "rss_kb": rss_kb,
+                  "modules": len(sys.modules),
+                  "heavy": sorted(m for m in sys.modules if m.split(".")[0] in %r)}))
+"""
+
+_BASE_PRICES = {"ABRA": 2000, "ASH": 58000, "DROWZEE": 5000, "JOLTEON": 7000,
+                "LUXRAY": 3000, "MISTY": 40000, "SHINX": 1000, "SUDOWOODO": 10000}
+
+
+def synthetic_stream(ticks, products=PRODUCTS, seed=0):
+    """Per-tick ``{product: (buy_orders, sell_orders)}`` from a 3-level random-walk book."""
+    rng = np.random.default_rng(seed)
+    columns = {}
+    for product in products:
+        mid = _BASE_PRICES.get(product, 1000) + np.cumsum(rng.integers(-2, 3, ticks))
+        half = rng.integers(1, 5, ticks)
+        volumes = rng.integers(1, 30, (ticks, 6))
+        columns[product] = ((mid - half).tolist(), (mid + half).tolist(), volumes.tolist())
+    stream = []
+    for t in range(ticks):
+        tick = {}
+        for product, (bids, asks, volumes) in columns.items():
+            bid, ask, vol = bids[t], asks[t], volumes[t]
+            tick[product] = ({bid: vol[0], bid - 1: vol[1], bid - 2: vol[2]},
+                             {ask: vol[3], ask + 1: vol[4], ask + 2: vol[5]})
+        stream.append(tick)
+    return stream
+
+
+def recorded_stream(data_dir, products=PRODUCTS, ticks=None):
+    from tradebotx.backtest import level_dicts
+    from tradebotx.tickstore import load_prices
+
+    levels = {}
+    for product in products:
+        table = load_prices(product, data_dir)
+        levels[product] = (level_dicts(table, "bid"), level_dicts(table, "ask"))
+    n = min(len(bids) for bids, _ in levels.values())
+    n = min(n, ticks) if ticks else n
+    return [{p: (bids[t], asks[t]) for p, (bids, asks) in levels.items()} for t in range(n)]
+
+
+class _State:
+    def __init__(self, timestamp, order_depth, positions):
+        self.timestamp = timestamp
+        self.order_depth = order_depth
+        self.positions = positions
+
+
+def _timed(step, items):
+    """Run ``step`` per item; returns ticks/sec and latency percentiles."""
+    histogram = LatencyHistogram()
+    clock = time.perf_counter_ns
+    start = clock()
+    for item in items:
+        t0 = clock()
+        step(item)
+        histogram.record(clock() - t0)
+    elapsed = (clock() - start) / 1e9
+    return {
+        "ticks_per_sec": len(items) / elapsed if elapsed else 0.0,
+        "p50_us": histogram.percentile(0.50) / 1e3,
+        "p99_us": histogram.percentile(0.99) / 1e3,
+    }
+
+
+def _peak_kb(step, items):
+    tracemalloc.start()
+    for item in items:
+        step(item)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak / 1024
+
+
+def bench_strategies(stream, memory_ticks=2000):
+    from Strategy_24B2184 import Trader
+
+    results = {}
+    for product in stream[0]:
+        def make_step(strategy):
+            def step(tick):
+                buy, sell = tick[product]
+                strategy.get_orders(None, BookView(buy, sell), 0)
+            return step
+
+        results[f"strategy.{product}"] = _timed(make_step(Trader().strategies[product]), stream)
+        results[f"strategy.{product}"]["peak_kb"] = _peak_kb(
+            make_step(Trader().strategies[product]), stream[:memory_ticks])
+
+    def make_trader_step(trader):
+        def step(tick):
+            depth = {p: BookView(buy, sell) for p, (buy, sell) in tick.items()}
+            trader.run(_State(0, depth, {}))
+        return step
+
+    results["trader.run"] = _timed(make_trader_step(Trader()), stream)
+    results["trader.run"]["peak_kb"] = _peak_kb(make_trader_step(Trader()), stream[:memory_ticks])
+    return results
+
+
+def bench_indicators(n=100000, seed=0):
+    prices = (5000 + np.cumsum(np.random.default_rng(seed).integers(-2, 3, n))).tolist()
+
+    def zscore():
+        stats = RollingStats(200)
+        for x in prices:
+            stats.update(x)
+            stats.zscore(x)
+
+    def macd():
+        m = MACD()
+        for x in prices:
+            m.update(x)
+            m.cross_up
+
+    def rsi():
+        r = RSI(14)
+        for x in prices:
+            r.update(x)
+            r.value
+
+    def bollinger():
+        stats = RollingStats(20)
+        for x in prices:
+            stats.update(x)
+            mean, std = stats.mean, stats.std
+            mean + 2 * std, mean - 2 * std
+
+    def ema():
+        e = EMA(26)
+        for x in prices:
+            e.update(x)
+
+    results = {}
+    for name, fn in (("zscore200", zscore), ("macd", macd), ("rsi14", rsi),
+                     ("bollinger20", bollinger), ("ema26", ema)):
+        start = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - start
+        results[f"indicator.{name}"] = {"ticks_per_sec": n / elapsed}
+    return results
+
+
+def bench_startup(repeats=5):
+    """Median import time, whole-process time and peak RSS of a fresh interpreter importing the strategies."""
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    script = _STARTUP_SCRIPT % (HEAVY_MODULES,)
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        out = subprocess.run([sys.executable, "-c", script], cwd=root, check=True,
+                             capture_output=True, text=True).stdout
+        sample = json.loads(out)
+        sample["process_ms"] = (time.perf_counter() - start) * 1e3
+        samples.append(sample)
+    result = {key: float(np.median([s[key] for s in samples]))
+              for key in ("import_ms", "process_ms", "rss_kb", "modules")}
+    result["heavy"] = samples[0]["heavy"]
+    return {"startup": result}
+
+
+def run(ticks=20000, data_dir=None, seed=0):
+    stream = recorded_stream(data_dir, ticks=ticks) if data_dir else synthetic_stream(ticks, seed=seed)
+    results = {}
+    results.update(bench_indicators(seed=seed))
+    results.update(bench_strategies(stream))
+    results.update(bench_startup())
+    return {
+        "meta": {
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": sys.version.split()[0],
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "ticks": len(stream),
+            "source": data_dir or "synthetic",
+        },
+        "results": results,
+    }
+
+
+def compare(baseline, current, threshold=0.10):
+    """Rows of (name, metric, old, new, relative change, regressed)."""
+    rows = []
+    for name, old_metrics in baseline["results"].items():
+        new_metrics = current["results"].get(name)
+        if new_metrics is None:
+            continue
+        for metric, higher_is_better in METRICS.items():
+            if metric not in old_metrics or metric not in new_metrics:
+                continue
+            old, new = old_metrics[metric], new_metrics[metric]
+            change = (new - old) / old if old else 0.0
+            regressed = change < -threshold if higher_is_better else change > threshold
+            rows.append((name, metric, old, new, change, regressed))
+    return rows
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Strategy and indicator benchmarks")
+    sub = parser.add_subparsers(dest="command", required=True)
+    run_parser = sub.add_parser("run")
+    run_parser.add_argument("--out", default="bench.json")
+    run_parser.add_argument("--ticks", type=int, default=20000)
+    run_parser.add_argument("--data-dir", help="replay recorded books instead of a synthetic stream")
+    run_parser.add_argument("--seed", type=int, default=0)
+    cmp_parser = sub.add_parser("compare")
+    cmp_parser.add_argument("baseline")
+    cmp_parser.add_argument("current")
+    cmp_parser.add_argument("--threshold", type=float, default=0.10)
+    startup_parser = sub.add_parser("startup", help="import time and memory of a fresh process")
+    startup_parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    if args.command == "startup":
+        result = bench_startup(args.repeats)["startup"]
+        print(f"import {result['import_ms']:.1f} ms, process {result['process_ms']:.1f} ms, "
+              f"peak RSS {result['rss_kb'] / 1024:.1f} MB, {result['modules']:.0f} modules")
+        if result["heavy"]:
+            print(f"runtime imports heavy modules: {', '.join(result['heavy'])}")
+            return 1
+        return 0
+
+    if args.command == "run":
+        report = run(args.ticks, args.data_dir, args.seed)
+        with open(args.out, "w") as f:
+            json.dump(report, f, indent=1)
+        for name, metrics in report["results"].items():
+            print(f"{name:<22}" + "".join(f"{k}={v:,.2f}  " for k, v in metrics.items()
+                                            if not isinstance(v, list)))
+        return 0
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.current) as f:
+        current = json.load(f)
+    regressions = 0
+    for name, metric, old, new, change, regressed in compare(baseline, current, args.threshold):
+        flag = "REGRESSION" if regressed else ""
+        regressions += regressed
+        print(f"{name:<22}{metric:<15}{old:>14,.2f}{new:>14,.2f}{change:>+9.1%}  {flag}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,47 @@
+"""Top-of-book view shared by every strategy on a tick."""
+
+
+class BookView:
+    """An order book plus its best bid/ask, top volumes, spread and mid.
+
+    The extrema are found once when the view is built (``Trader.run`` builds
+    one per product per tick), so strategies read them as attributes instead
+    of each rescanning ``buy_orders``/``sell_orders``.  The view describes the
+    book as it was at construction; it does not track later mutation.
+    """
+
+    __slots__ = ("buy_orders", "sell_orders", "best_bid", "best_ask",
+                 "bid_volume", "ask_volume", "spread", "mid", "ordered")
+
+    def __init__(self, buy_orders, sell_orders, best_bid=None, best_ask=None, ordered=False):
+        self.buy_orders = buy_orders
+        self.sell_orders = sell_orders
+        # True when both dicts iterate best level first, so the top levels need no sort
+        self.ordered = ordered
+        if best_bid is None and buy_orders:
+            best_bid = max(buy_orders)
+        if best_ask is None and sell_orders:
+            best_ask = min(sell_orders)
+        self.best_bid = best_bid
+        self.best_ask = best_ask
+        self.bid_volume = buy_orders[best_bid] if best_bid is not None else 0
+        self.ask_volume = sell_orders[best_ask] if best_ask is not None else 0
+        if best_bid is not None and best_ask is not None:
+            self.spread = best_ask - best_bid
+            self.mid = (best_ask + best_bid) / 2
+        else:
+            self.spread = None
+            self.mid = None
+
+    @classmethod
+    def of(cls, orderbook):
+        """View of any object with ``buy_orders``/``sell_orders`` (views pass through)."""
+        if isinstance(orderbook, cls):
+            return orderbook
+        return cls(orderbook.buy_orders, orderbook.sell_orders)
+
+    @classmethod
+    def from_sorted(cls, buy_orders, sell_orders):
+        """View of level dicts already ordered best level first; no scan needed."""
+        return cls(buy_orders, sell_orders, next(iter(buy_orders), None), next(iter(sell_orders), None),
+                   ordered=True)
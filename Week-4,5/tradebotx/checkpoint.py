@@ -0,0 +1,128 @@
+"""Binary checkpoints of a running trader, written off the hot path.
+
+A checkpoint is the whole trader object graph (strategies, price
+histories, indicator accumulators, entry prices, shared engines) pickled
+with protocol 5, zlib-compressed, behind a small versioned header.  Object
+identity is preserved, so strategies still share the restored engines.
+Anything tied to the process (profilers, worker pools, the checkpointer
+itself) is left out by the objects' own pickling hooks.
+
+``Checkpointer.save`` pickles synchronously, which is the only consistent
+moment to copy the state, and hands the bytes to a writer thread that
+compresses and atomically replaces the file, so the tick only pays for the
+pickle.  If a write is still in progress the newer state replaces the
+queued one.
+
+    trader = Trader(checkpoint_path="trader.ckpt", checkpoint_every=1000)
+    ...
+    trader = Trader.from_checkpoint("trader.ckpt")   # warm indicators, no re-warm-up
+"""
+import os
+import pickle
+import struct
+import threading
+import zlib
+
+MAGIC = b"TBXCKPT"
+VERSION = 1
+_HEADER = struct.Struct("<7sBQ")  # magic, version, tick
+
+
+def encode(tick, payload, level=1):
+    """Checkpoint bytes for a pickled ``payload`` taken at ``tick``."""
+    return _HEADER.pack(MAGIC, VERSION, tick) + zlib.compress(payload, level)
+
+
+def decode(data):
+    """``(tick, obj)`` from checkpoint bytes; ``ValueError`` if they are not a whole checkpoint."""
+    if len(data) < _HEADER.size:
+        raise ValueError("truncated checkpoint")
+    magic, version, tick = _HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError("not a tradebotx checkpoint")
+    if version != VERSION:
+        raise ValueError(f"checkpoint version {version}, expected {VERSION}")
+    try:
+        payload = zlib.decompress(data[_HEADER.size:])
+    except zlib.error as exc:
+        raise ValueError("truncated or corrupt checkpoint") from exc
+    return tick, pickle.loads(payload)
+
+
+def write(path, tick, payload):
+    tmp = f"{path}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(encode(tick, payload))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def load(path):
+    """``(tick, obj)`` from a checkpoint file."""
+    with open(path, "rb") as f:
+        return decode(f.read())
+
+
+class Checkpointer:
+    """Saves an object every ``every`` calls to ``tick`` on a background thread."""
+
+    def __init__(self, path, every=1000):
+        self.path = path
+        self.every = every
+        self.ticks = 0
+        self.saved = 0
+        self.error = None
+        self._pending = None
+        self._cond = threading.Condition()
+        self._busy = False
+        self._closed = False
+        self._thread = threading.Thread(target=self._writer, name="checkpoint-writer", daemon=True)
+        self._thread.start()
+
+    def tick(self, obj):
+        self.ticks += 1
+        if self.ticks % self.every == 0:
+            self.save(obj)
+
+    def save(self, obj):
+        if self.error is not None:
+            raise RuntimeError(f"checkpoint writer failed: {self.error!r}") from self.error
+        payload = (self.ticks, pickle.dumps(obj, protocol=5))
+        with self._cond:
+            self._pending = payload
+            self._cond.notify()
+
+    def _writer(self):
+        while True:
+            with self._cond:
+                while self._pending is None and not self._closed:
+                    self._cond.wait()
+                if self._pending is None:
+                    return
+                (tick, payload), self._pending = self._pending, None
+                self._busy = True
+            try:
+                write(self.path, tick, payload)
+                self.saved += 1
+            except Exception as exc:
+                self.error = exc
+            with self._cond:
+                self._busy = False
+                self._cond.notify_all()
+
+    def flush(self):
+        """Block until every queued checkpoint is on disk."""
+        with self._cond:
+            while self._pending is not None or self._busy:
+                self._cond.wait()
+
+    def close(self):
+        self.flush()
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join()
+
+    def __getstate__(self):
+        raise TypeError("Checkpointer is not part of a checkpoint")
@@ -0,0 +1,79 @@
+"""Event dispatch for ``BaseClass`` strategies.
+
+Classic strategies (``event_driven = False``) get ``get_orders`` on every
+tick, as before.  Event-driven strategies get callbacks only when one of
+their inputs changed:
+
+* ``on_fill(state, product, quantity)`` when their position moved since the
+  last tick (``quantity`` is the signed net fill),
+* ``on_trade(state, trades)`` when ``state.market_trades`` has trades in a
+  subscribed product,
+* ``on_book_update(state, orderbook, position)`` when a subscribed book, the
+  position or the trades changed.
+
+On a tick where nothing they subscribe to changed, the orders they returned
+last time are resent without calling them at all, so quiet books cost one
+tuple comparison per product.
+"""
+from tradebotx.profiler import NULL_PROFILER
+
+
+def _book_key(book):
+    # a copy, not the dicts themselves: the backtester consumes liquidity from them
+    return tuple(book.buy_orders.items()), tuple(book.sell_orders.items())
+
+
+class EventDispatcher:
+    def __init__(self, strategies, profiler=NULL_PROFILER):
+        self.strategies = strategies
+        self.profiler = profiler
+        self.skipped = 0
+        self._books = {}
+        self._positions = {}
+        self._orders = {}
+        # only books some event-driven strategy subscribes to need change tracking
+        self._watched = {product for strategy in strategies.values() if strategy.event_driven
+                         for product in strategy.subscriptions()}
+
+    def dispatch(self, state, books, positions):
+        """``{product: orders}`` for every product in ``books``."""
+        changed = set()
+        for product in self._watched:
+            book = books.get(product)
+            if book is None:
+                continue
+            key = _book_key(book)
+            if self._books.get(product) != key:
+                self._books[product] = key
+                changed.add(product)
+        trades = getattr(state, "market_trades", None) or {}
+
+        profiler = self.profiler
+        result = {}
+        for product, orderbook in books.items():
+            strategy = self.strategies[product]
+            position = positions.get(product, 0)
+            if not strategy.event_driven:
+                profiler.begin(product)
+                result[product] = strategy.get_orders(state, orderbook, position)
+                profiler.end()
+                continue
+
+            subscribed = strategy.subscriptions()
+            fill = position - self._positions.get(product, 0)
+            self._positions[product] = position
+            new_trades = {p: trades[p] for p in subscribed if trades.get(p)}
+            if not (fill or new_trades or product not in self._orders
+                    or any(p in changed for p in subscribed)):
+                self.skipped += 1
+                result[product] = self._orders[product]
+                continue
+
+            profiler.begin(product)
+            if fill:
+                strategy.on_fill(state, product, fill)
+            if new_trades:
+                strategy.on_trade(state, new_trades)
+            result[product] = self._orders[product] = strategy.on_book_update(state, orderbook, position)
+            profiler.end()
+        return result
@@ -0,0 +1,111 @@
+"""Depth-aware fair values: microprice and multi-level book imbalance.
+
+Quoting around ``(best_ask + best_bid) // 2`` ignores which side of the
+book is heavier.  ``FairValueEngine.update`` takes the top ``levels`` of
+every product's book once per tick into ``(product, side, level)`` arrays
+and computes, for all products at once:
+
+* ``microprice``: ``(bid * ask_volume + ask * bid_volume) / (bid_volume +
+  ask_volume)`` at the top of the book,
+* ``imbalance``: ``(B - A) / (B + A)`` in [-1, 1], where ``B`` and ``A`` are
+  bid and ask depth with level ``k`` weighted by ``decay ** k``,
+* ``fair``: ``mid + imbalance * spread / 2``, the microprice generalised to
+  weighted depth (with one level it is the microprice exactly).
+
+The depth weights are one matrix product.  Books replayed from the tick
+store iterate best level first (``BookView.ordered``), so their top levels
+are read off in O(``levels``) however deep the book is; other books need
+one ``heapq`` pass.  Volumes are taken as absolute values, like
+``backtest.level_dicts``, since some feeds sign the ask side negative.
+Products without both sides are NaN (``get`` returns ``None``).
+
+``Trader(fair_values=True)`` turns the engine on; by default the strategies
+keep quoting around the integer mid and SUDOWOODO around its fixed 10000.
+
+``OnlineFairValue`` estimates the level a stable product (SUDOWOODO) trades
+around: an exponentially weighted mean of its fair values, started from a
+prior that counts as ``prior_weight`` observations and fades out like them.
+"""
+import heapq
+import math
+from itertools import islice
+
+import numpy as np
+
+from tradebotx.tickstore import LEVELS, PRODUCTS
+
+_NAN = float("nan")
+
+
+def _top_volumes(levels, n, bids, ordered):
+    """Absolute volumes of the ``n`` best levels of a ``{price: volume}`` side, zero-padded."""
+    if ordered:
+        volumes = [abs(v) for v in islice(levels.values(), n)]
+    else:
+        best = heapq.nlargest(n, levels) if bids else heapq.nsmallest(n, levels)
+        volumes = [abs(levels[p]) for p in best]
+    return volumes + [0] * (n - len(volumes))
+
+
+class FairValueEngine:
+    def __init__(self, products=PRODUCTS, levels=LEVELS, decay=0.5):
+        self.products = tuple(products)
+        self.index = {product: i for i, product in enumerate(self.products)}
+        self.levels = levels
+        # column 0 weighs the top level only (the microprice), column 1 every level by decay ** k
+        self.weights = np.zeros((levels, 2))
+        self.weights[0, 0] = 1.0
+        self.weights[:, 1] = decay ** np.arange(levels, dtype=np.float64)
+        self.microprice = [_NAN] * len(self.products)
+        self.imbalance = [0.0] * len(self.products)
+        self.fair = [_NAN] * len(self.products)
+
+    def update(self, books):
+        """Recompute every product's fair value from this tick's ``{product: BookView}``."""
+        n = self.levels
+        empty = [_NAN, _NAN] + [0] * (2 * n)
+        values = []
+        extend = values.extend
+        for product in self.products:
+            book = books.get(product)
+            if book is None or book.best_bid is None or book.best_ask is None:
+                extend(empty)
+                continue
+            values.append(book.best_bid)
+            values.append(book.best_ask)
+            extend(_top_volumes(book.buy_orders, n, True, book.ordered))
+            extend(_top_volumes(book.sell_orders, n, False, book.ordered))
+
+        table = np.array(values, dtype=np.float64).reshape(len(self.products), 2 + 2 * n)
+        # (product, side, weighting) depth, then (product, weighting) imbalance
+        depth = table[:, 2:].reshape(-1, 2, n) @ self.weights
+        total = depth[:, 0] + depth[:, 1]
+        imbalance = np.divide(depth[:, 0] - depth[:, 1], total, out=np.zeros_like(total), where=total > 0)
+        bid, ask = table[:, 0:1], table[:, 1:2]
+        fair = (bid + ask) / 2 + imbalance * (ask - bid) / 2
+        self.microprice, self.fair = fair.T.tolist()
+        self.imbalance = imbalance[:, 1].tolist()
+
+    def get(self, product):
+        """This tick's fair value of ``product``, or ``None`` without a two-sided book."""
+        i = self.index.get(product)
+        if i is None:
+            return None
+        value = self.fair[i]
+        return None if math.isnan(value) else value
+
+
+class OnlineFairValue:
+    def __init__(self, prior, span=1000, prior_weight=100):
+        self._beta = 1 - 2 / (span + 1)
+        self._num = prior * prior_weight
+        self._den = float(prior_weight)
+
+    def update(self, x):
+        self._num = self._beta * self._num + x
+        self._den = self._beta * self._den + 1
+        return self._num / self._den
+
+    @property
+    def value(self):
+        return self._num / self._den
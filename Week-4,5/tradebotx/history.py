@@ -0,0 +1,63 @@
+"""Fixed-capacity price history."""
+import numpy as np
+
+
+class PriceHistory:
+    """Last ``capacity`` prices in one preallocated NumPy array.
+
+    Every value is written twice, at ``i`` and ``i + capacity``, so the most
+    recent ``n`` values are always one contiguous slice and ``window(n)`` can
+    return a view instead of a copy.  Memory stays constant however long the
+    session runs.
+    """
+
+    def __init__(self, capacity, dtype=np.float64):
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.capacity = capacity
+        self.count = 0
+        self._buf = np.zeros(2 * capacity, dtype=dtype)
+        self._head = 0
+
+    def append(self, x):
+        head = self._head
+        self._buf[head] = x
+        self._buf[head + self.capacity] = x
+        head += 1
+        self._head = head if head < self.capacity else 0
+        self.count += 1
+
+    def extend(self, values):
+        """``append`` every value in order; only the last ``capacity`` are written."""
+        values = np.asarray(values)
+        n = len(values)
+        m = min(n, self.capacity)
+        slots = (self._head + np.arange(n - m, n)) % self.capacity
+        self._buf[slots] = values[n - m:]
+        self._buf[slots + self.capacity] = values[n - m:]
+        self._head = (self._head + n) % self.capacity
+        self.count += n
+
+    def __len__(self):
+        return min(self.count, self.capacity)
+
+    def window(self, n=None):
+        """Read-only view of the last ``n`` values (all stored values by default)."""
+        size = len(self)
+        n = size if n is None else min(n, size)
+        end = self._head + self.capacity
+        view = self._buf[end - n:end]
+        view.flags.writeable = False
+        return view
+
+    @property
+    def last(self):
+        if not self.count:
+            raise IndexError("empty PriceHistory")
+        return self._buf[self._head + self.capacity - 1]
+
+    def __getitem__(self, key):
+        return self.window()[key]
+
+    def __iter__(self):
+        return iter(self.window())
@@ -0,0 +1,314 @@
+"""Streaming technical indicators.
+
+Every indicator is updated once per new price and answers queries in O(1),
+replacing the per-tick ``pd.Series(self.prices[-lookback:])`` rebuilds.
+
+Agreement with the pandas versions used before:
+
+* ``RollingStats`` and ``RSI(method="sma")`` match ``rolling(n).mean()``,
+  ``rolling(n).std()`` and the ``rolling(14)`` RSI exactly for integer prices
+  and to ~1e-9 relative error for float prices.
+* ``EMA`` and ``MACD`` are exact ``ewm(span=n).mean()`` values over the whole
+  price stream.  The old code rebuilt the EWMs on the last ``lookback`` prices
+  only, and for a short window that is a different indicator: each rebuild
+  restarts the EMAs at the window's first price, so the first values of the
+  MACD line are far from the stream's and still carry weight in the signal
+  line.  Over LUXRAY's 50 tick window two thirds of the crossovers moved;
+  over the 200/300 tick windows of SHINX and MISTY the lines agree to about
+  1e-5 and the crossovers are the same (``tests/test_indicators.py``).
+* ``WindowedMACD`` is that windowed indicator: the pandas MACD of the last
+  ``window`` prices, recomputed every tick.  Each of its values is a fixed
+  linear combination of the window, so it is one dot product with weights
+  computed once per window length instead of three ``ewm`` passes.
+"""
+import math
+from collections import deque
+from operator import mul
+
+
+class RollingStats:
+    """Mean and sample standard deviation of the last ``window`` values."""
+
+    def __init__(self, window):
+        self.window = window
+        self.count = 0
+        self._buf = [0.0] * window
+        self._idx = 0
+        self._shift = 0.0
+        self._sum = 0.0
+        self._sumsq = 0.0
+        self._since_resync = 0
+
+    def update(self, x):
+        if self.count == 0:
+            self._shift = x
+        d = x - self._shift
+        if self.count >= self.window:
+            old = self._buf[self._idx] - self._shift
+            self._sum -= old
+            self._sumsq -= old * old
+        self._buf[self._idx] = x
+        self._idx = (self._idx + 1) % self.window
+        self._sum += d
+        self._sumsq += d * d
+        self.count += 1
+        self._since_resync += 1
+        # Re-anchor the shifted sums once per window so float error can't build up
+        if self._since_resync >= self.window:
+            self._resync()
+
+    def _resync(self):
+        values = self._buf if self.count >= self.window else self._buf[:self._idx]
+        self._shift = values[self._idx - 1]
+        self._sum = 0.0
+        self._sumsq = 0.0
+        for v in values:
+            d = v - self._shift
+            self._sum += d
+            self._sumsq += d * d
+        self._since_resync = 0
+
+    @property
+    def n(self):
+        return min(self.count, self.window)
+
+    @property
+    def full(self):
+        return self.count >= self.window
+
+    @property
+    def mean(self):
+        n = self.n
+        if n == 0:
+            return math.nan
+        return self._shift + self._sum / n
+
+    @property
+    def var(self):
+        n = self.n
+        if n < 2:
+            return math.nan
+        return max((self._sumsq - self._sum * self._sum / n) / (n - 1), 0.0)
+
+    @property
+    def std(self):
+        return math.sqrt(self.var)
+
+    def zscore(self, x):
+        std = self.std
+        return (x - self.mean) / std if std != 0 else 0
+
+
+class EMA:
+    """``pd.Series.ewm(span=span).mean()`` (``adjust=True``) evaluated incrementally."""
+
+    def __init__(self, span):
+        self.span = span
+        self.alpha = 2 / (span + 1)
+        self._beta = 1 - self.alpha
+        self._num = 0.0
+        self._den = 0.0
+        self.count = 0
+
+    def update(self, x):
+        self._num = self._beta * self._num + x
+        self._den = self._beta * self._den + 1
+        self.count += 1
+        return self._num / self._den
+
+    @property
+    def value(self):
+        return self._num / self._den if self.count else math.nan
+
+
+class MACD:
+    """MACD line, signal line and crossover flags against the previous tick."""
+
+    def __init__(self, fast=12, slow=26, signal=9):
+        self.fast = EMA(fast)
+        self.slow = EMA(slow)
+        self.signal_ema = EMA(signal)
+        self.macd = math.nan
+        self.signal = math.nan
+        self.prev_macd = math.nan
+        self.prev_signal = math.nan
+
+    def update(self, x):
+        self.prev_macd = self.macd
+        self.prev_signal = self.signal
+        self.macd = self.fast.update(x) - self.slow.update(x)
+        self.signal = self.signal_ema.update(self.macd)
+
+    @property
+    def cross_up(self):
+        return self.prev_macd < self.prev_signal and self.macd > self.signal
+
+    @property
+    def cross_down(self):
+        return self.prev_macd > self.prev_signal and self.macd < self.signal
+
+
+def _ewm_rows(span, n):
+    """``rows[j][i]``: weight of ``x[i]`` in ``ewm(span=span).mean()`` at ``j``, for ``len(x) == n``."""
+    beta = 1 - 2 / (span + 1)
+    rows = []
+    den = 0.0
+    for j in range(n):
+        den = beta * den + 1
+        rows.append([beta ** (j - i) / den for i in range(j + 1)])
+    return rows
+
+
+class WindowedMACD:
+    """``MACD`` as pandas computes it on ``pd.Series(prices[-window:])``.
+
+    ``macd``/``signal`` are the last values of the MACD and signal lines over
+    the current window, ``prev_macd``/``prev_signal`` the second-to-last ones
+    (the same window without its newest price), which is what the old
+    ``iloc[-2]``/``iloc[-1]`` crossover test compared.  Values are computed on
+    first read after an update, as dot products of the window's deviations
+    from its newest price (the weights sum to zero, so a flat window is
+    exactly zero instead of rounding noise).
+    """
+
+    def __init__(self, fast=12, slow=26, signal=9, window=50):
+        self.fast = fast
+        self.slow = slow
+        self.signal_span = signal
+        self.window = window
+        self.count = 0
+        self._prices = deque(maxlen=window)
+        self._weights = {}
+        self._values = None
+
+    def _rows(self, n):
+        """Weights of the window's values in (macd, signal) at its last element, for length ``n``."""
+        rows = self._weights.get(n)
+        if rows is None:
+            fast, slow = _ewm_rows(self.fast, n), _ewm_rows(self.slow, n)
+            line = [[f - s for f, s in zip(fr, sr)] for fr, sr in zip(fast, slow)]
+            smooth = _ewm_rows(self.signal_span, n)[-1]
+            signal = [sum(smooth[j] * line[j][i] for j in range(i, n)) for i in range(n)]
+            rows = self._weights[n] = (line[-1], signal)
+        return rows
+
+    def update(self, x):
+        self._prices.append(x)
+        self.count += 1
+        self._values = None
+
+    def _compute(self):
+        n = len(self._prices)
+        if n == 0:
+            self._values = (math.nan,) * 4
+            return self._values
+        last = self._prices[-1]
+        deviations = [x - last for x in self._prices]
+        macd_w, signal_w = self._rows(n)
+        macd = sum(map(mul, macd_w, deviations))
+        signal = sum(map(mul, signal_w, deviations))
+        if n > 1:
+            prev_macd_w, prev_signal_w = self._rows(n - 1)
+            # the previous-window weights apply to deviations from the same newest price
+            # (their rows sum to zero too), so no second deviation list is needed
+            prev_macd = sum(map(mul, prev_macd_w, deviations))
+            prev_signal = sum(map(mul, prev_signal_w, deviations))
+        else:
+            prev_macd = prev_signal = math.nan
+        self._values = (macd, signal, prev_macd, prev_signal)
+        return self._values
+
+    @property
+    def macd(self):
+        return (self._values or self._compute())[0]
+
+    @property
+    def signal(self):
+        return (self._values or self._compute())[1]
+
+    @property
+    def prev_macd(self):
+        return (self._values or self._compute())[2]
+
+    @property
+    def prev_signal(self):
+        return (self._values or self._compute())[3]
+
+    @property
+    def cross_up(self):
+        macd, signal, prev_macd, prev_signal = self._values or self._compute()
+        return prev_macd < prev_signal and macd > signal
+
+    @property
+    def cross_down(self):
+        macd, signal, prev_macd, prev_signal = self._values or self._compute()
+        return prev_macd > prev_signal and macd < signal
+
+
+class RSI:
+    """Relative strength index over ``period`` price changes.
+
+    ``method="sma"`` averages the last ``period`` gains/losses (the
+    ``rolling(14).mean()`` form used by the strategies); ``method="wilder"``
+    uses Wilder's smoothing seeded with that same simple average.
+    """
+
+    def __init__(self, period=14, method="sma"):
+        if method not in ("sma", "wilder"):
+            raise ValueError(f"unknown RSI method: {method}")
+        self.period = period
+        self.method = method
+        self.count = 0
+        self._prev = None
+        self._gains = [0.0] * period
+        self._losses = [0.0] * period
+        self._idx = 0
+        self._gain_sum = 0.0
+        self._loss_sum = 0.0
+        self._avg_gain = math.nan
+        self._avg_loss = math.nan
+
+    def update(self, x):
+        prev, self._prev = self._prev, x
+        if prev is None:
+            return
+        delta = x - prev
+        gain = delta if delta > 0 else 0.0
+        loss = -delta if delta < 0 else 0.0
+        self.count += 1
+
+        if self.method == "wilder" and self.count > self.period:
+            p = self.period
+            self._avg_gain = (self._avg_gain * (p - 1) + gain) / p
+            self._avg_loss = (self._avg_loss * (p - 1) + loss) / p
+            return
+
+        if self.count > self.period:
+            self._gain_sum -= self._gains[self._idx]
+            self._loss_sum -= self._losses[self._idx]
+        self._gains[self._idx] = gain
+        self._losses[self._idx] = loss
+        self._idx = (self._idx + 1) % self.period
+        self._gain_sum += gain
+        self._loss_sum += loss
+        if self._idx == 0:
+            self._gain_sum = sum(self._gains)
+            self._loss_sum = sum(self._losses)
+        if self.count >= self.period:
+            self._avg_gain = self._gain_sum / self.period
+            self._avg_loss = self._loss_sum / self.period
+
+    @property
+    def avg_gain(self):
+        return self._avg_gain
+
+    @property
+    def avg_loss(self):
+        return self._avg_loss
+
+    @property
+    def value(self):
+        avg_gain, avg_loss = self.avg_gain, self.avg_loss
+        if avg_loss == 0 or math.isnan(avg_loss):
+            return 100 if avg_gain > 0 else 50
+        return 100 - (100 / (1 + avg_gain / avg_loss))
@@ -0,0 +1,311 @@
+"""Price-time priority matching simulator with queues, latency and fees.
+
+Unlike ``Backtester``, which drops whatever does not cross at the end of the
+tick, orders here rest on the book:
+
+* the order set a trader returns on tick ``t`` reaches the exchange on tick
+  ``t + latency`` and replaces that product's live orders; an order at the
+  same price and side as a live one keeps its place in the queue and what is
+  left of it (at most the size resent: a partly filled order is not topped
+  back up, cancel it and send a new one for that),
+* on arrival an order first takes whatever it crosses in the visible book
+  (``taker_fee`` per unit), and the remainder joins the back of its price
+  level: the visible volume there is queued ahead of it,
+* recorded trades at a resting order's price eat the queue ahead of it
+  before filling it, and trades through its price fill it outright; volume
+  that disappears from its level without trading shrinks the queue (cancels
+  are assumed to come from ahead); a book that moves through its price fills
+  it against the crossing levels (``maker_fee`` per unit for passive fills),
+* fills are clipped to the position limits and reported back on the next
+  state as ``own_trades`` (``{product: [(price, quantity), ...]}``), next to
+  that tick's ``market_trades``.  Own fills consume volume from a private
+  copy of the tick's book; the trader sees the book as recorded.
+
+The trade tape has no aggressor side, so any trade at or through a resting
+order's price is assumed able to reach it.
+
+    python -m tradebotx.matching --latency 1 --maker-fee 0 --taker-fee 0.5
+"""
+import math
+import warnings
+from collections import deque
+
+import numpy as np
+
+from tradebotx.backtest import Backtester, BacktestResult, level_dicts
+from tradebotx.book import BookView
+from tradebotx.tickstore import DATA_DIR, PRODUCTS, load_all, load_trades
+
+
+class MatchState:
+    __slots__ = ("timestamp", "order_depth", "positions", "own_trades", "market_trades")
+
+    def __init__(self, timestamp, order_depth, positions, own_trades, market_trades):
+        self.timestamp = timestamp
+        self.order_depth = order_depth
+        self.positions = positions
+        self.own_trades = own_trades
+        self.market_trades = market_trades
+
+
+class RestingOrder:
+    __slots__ = ("price", "remaining", "buy", "ahead")
+
+    def __init__(self, price, remaining, buy, ahead):
+        self.price = price
+        self.remaining = remaining
+        self.buy = buy
+        self.ahead = ahead
+
+
+class MatchResult(BacktestResult):
+    def __init__(self, timestamps, pnl_curve, positions, cash, turnover, fills,
+                 maker_volume, taker_volume, fees):
+        super().__init__(timestamps, pnl_curve, positions, cash, turnover, fills)
+        self.maker_volume = maker_volume
+        self.taker_volume = taker_volume
+        self.fees = fees
+
+    def summary(self):
+        summary = super().summary()
+        summary.update(maker_volume=self.maker_volume, taker_volume=self.taker_volume, fees=self.fees)
+        return summary
+
+
+class MatchingSimulator(Backtester):
+    """``Backtester`` with resting orders, queue position, latency and fees.
+
+    ``trades`` maps product to its trade ``TickTable`` (``timestamp``,
+    ``price``, ``quantity``); products without one only get passive fills
+    when the book moves through their orders.  ``latency`` is in ticks.
+    """
+
+    def __init__(self, trader, data, trades=None, latency=0, maker_fee=0.0, taker_fee=0.0, limits=None):
+        super().__init__(trader, data, limits)
+        self.trades = trades or {}
+        self.latency = latency
+        self.maker_fee = maker_fee
+        self.taker_fee = taker_fee
+
+    def _trade_tape(self, timestamps):
+        """Per product: trade prices, quantities and the end row of each tick's trades."""
+        tape = {}
+        for product, table in self.trades.items():
+            if product not in self.data:
+                continue
+            ends = np.searchsorted(table["timestamp"], timestamps, side="right").tolist()
+            quantities = np.abs(np.nan_to_num(table["quantity"])).astype(np.int64).tolist()
+            tape[product] = (table["price"].tolist(), quantities, ends)
+        return tape
+
+    def run(self):
+        timestamps, rows = self._timeline()
+        products = list(self.data)
+        books = {}
+        mids = {}
+        for product in products:
+            cols = self.data[product]
+            books[product] = (level_dicts(cols, "bid"), level_dicts(cols, "ask"))
+            mids[product] = ((cols["bid_price_1"] + cols["ask_price_1"]) / 2).tolist()
+        tape = self._trade_tape(timestamps)
+        trade_start = {product: 0 for product in tape}
+
+        self.positions = {product: 0 for product in products}
+        self.cash = 0.0
+        self.turnover = self.fills = self.maker_volume = self.taker_volume = 0
+        self.fees = 0.0
+        self.own_trades = {}
+        live = {product: [] for product in products}
+        pending = deque()
+        last_mid = {}
+        pnl_curve = np.empty(len(timestamps))
+
+        for t, timestamp in enumerate(timestamps.tolist()):
+            order_depth = {}
+            matching = {}
+            for product in products:
+                row = rows[product][t]
+                if row < 0:
+                    continue
+                bids, asks = books[product]
+                order_depth[product] = BookView.from_sorted(dict(bids[row]), dict(asks[row]))
+                matching[product] = BookView.from_sorted(dict(bids[row]), dict(asks[row]))
+                if not math.isnan(mids[product][row]):
+                    last_mid[product] = mids[product][row]
+
+            market_trades = {}
+            for product, (prices, quantities, ends) in tape.items():
+                start, end = trade_start[product], ends[t]
+                if end > start:
+                    market_trades[product] = list(zip(prices[start:end], quantities[start:end]))
+                    trade_start[product] = end
+                    self._fill_from_trades(product, live[product], market_trades[product])
+            for product, book in matching.items():
+                self._fill_from_book(product, live[product], book)
+
+            while pending and pending[0][0] <= t:
+                self._arrive(pending.popleft()[1], live, matching)
+
+            own_trades, self.own_trades = self.own_trades, {}
+            state = MatchState(timestamp, order_depth, dict(self.positions), own_trades, market_trades)
+            output = self.trader.run(state)
+            result = output[0] if isinstance(output, tuple) else output
+            # only what a strategy returned is replaced; products it skipped keep their orders
+            wanted = {product: [(o.price, o.quantity) for o in orders] for product, orders in result.items()}
+            if self.latency:
+                pending.append((t + self.latency, wanted))
+            else:
+                self._arrive(wanted, live, matching)
+
+            pnl_curve[t] = self.cash + sum(self.positions[p] * last_mid.get(p, 0.0) for p in products)
+
+        return MatchResult(timestamps, pnl_curve, self.positions, self.cash, self.turnover, self.fills,
+                           self.maker_volume, self.taker_volume, self.fees)
+
+    def _fill(self, product, price, quantity, maker):
+        """Book a fill of up to ``quantity`` (signed) at ``price``; returns the size actually filled."""
+        limit = self.limits.get(product, math.inf)
+        position = self.positions[product]
+        if quantity > 0:
+            quantity = min(quantity, limit - position)
+        else:
+            quantity = max(quantity, -limit - position)
+        if quantity == 0:
+            return 0
+        size = abs(quantity)
+        fee = (self.maker_fee if maker else self.taker_fee) * size
+        self.positions[product] = position + quantity
+        self.cash -= quantity * price + fee
+        self.fees += fee
+        self.turnover += size
+        self.fills += 1
+        if maker:
+            self.maker_volume += size
+        else:
+            self.taker_volume += size
+        self.own_trades.setdefault(product, []).append((price, quantity))
+        return size
+
+    def _take(self, product, order, levels, maker):
+        """Fill ``order`` against the crossing ``levels`` of a book, consuming their volume."""
+        if order.buy:
+            crossing = sorted(p for p in levels if p <= order.price)
+        else:
+            crossing = sorted((p for p in levels if p >= order.price), reverse=True)
+        for price in crossing:
+            if order.remaining <= 0:
+                break
+            want = min(order.remaining, levels[price])
+            # passive orders trade at their own price, aggressive ones at the book's
+            done = self._fill(product, order.price if maker else price, want if order.buy else -want, maker)
+            if not done:
+                order.remaining = 0
+                break
+            order.remaining -= done
+            levels[price] -= done
+            if not levels[price]:
+                del levels[price]
+
+    def _fill_from_trades(self, product, orders, trades):
+        for trade_price, trade_quantity in trades:
+            for buy in (True, False):
+                volume = trade_quantity
+                for order in orders:
+                    if order.buy != buy or order.remaining <= 0 or volume <= 0:
+                        continue
+                    if (trade_price < order.price) if buy else (trade_price > order.price):
+                        take = min(order.remaining, volume)
+                    elif trade_price == order.price:
+                        used = min(order.ahead, volume)
+                        order.ahead -= used
+                        volume -= used
+                        take = min(order.remaining, volume)
+                    else:
+                        continue
+                    if take > 0:
+                        done = self._fill(product, order.price, take if buy else -take, True)
+                        order.remaining = order.remaining - done if done else 0
+                        # volume a limit-clipped fill did not use is left for the next order
+                        volume -= done
+        orders[:] = [order for order in orders if order.remaining > 0]
+
+    def _fill_from_book(self, product, orders, book):
+        for order in orders:
+            if order.buy:
+                if book.best_ask is not None and book.best_ask <= order.price:
+                    self._take(product, order, book.sell_orders, True)
+                order.ahead = min(order.ahead, book.buy_orders.get(order.price, 0))
+            else:
+                if book.best_bid is not None and book.best_bid >= order.price:
+                    self._take(product, order, book.buy_orders, True)
+                order.ahead = min(order.ahead, book.sell_orders.get(order.price, 0))
+        orders[:] = [order for order in orders if order.remaining > 0]
+
+    def _arrive(self, wanted, live, books):
+        """Replace each product's live orders with the ones just reaching the exchange."""
+        for product, requested in wanted.items():
+            old = {(order.price, order.buy): order for order in live[product]}
+            book = books.get(product)
+            orders = []
+            for price, quantity in requested:
+                if not quantity:
+                    continue
+                buy = quantity > 0
+                kept = old.pop((price, buy), None)
+                if kept is not None:
+                    kept.remaining = min(kept.remaining, abs(quantity))
+                    orders.append(kept)
+                    continue
+                order = RestingOrder(price, abs(quantity), buy, 0)
+                if book is not None:
+                    self._take(product, order, book.sell_orders if buy else book.buy_orders, False)
+                    order.ahead = (book.buy_orders if buy else book.sell_orders).get(price, 0)
+                if order.remaining > 0:
+                    orders.append(order)
+            live[product] = orders
+
+
+def load_trade_tables(products, data_dir=DATA_DIR):
+    """Trade tables of the products that have a trade file; warns about the others."""
+    trades = {}
+    for product in products:
+        try:
+            trades[product] = load_trades(product, data_dir)
+        except FileNotFoundError:
+            warnings.warn(f"no trade tape for {product} in {data_dir}; "
+                          "it only gets passive fills when the book moves through its orders")
+    return trades
+
+
+def main(argv=None):
+    import argparse
+    import time
+
+    from tradebotx.backtest import StrategyTrader
+
+    parser = argparse.ArgumentParser(description="Replay books and trades through the matching simulator")
+    parser.add_argument("products", nargs="*", default=list(PRODUCTS))
+    parser.add_argument("--data-dir", default=DATA_DIR)
+    parser.add_argument("--latency", type=int, default=1, help="ticks between sending and arrival")
+    parser.add_argument("--maker-fee", type=float, default=0.0, help="per unit filled passively")
+    parser.add_argument("--taker-fee", type=float, default=0.0, help="per unit filled aggressively")
+    args = parser.parse_args(argv)
+
+    from Strategy_24B2184 import Trader
+
+    data = load_all(args.products, args.data_dir)
+    trades = load_trade_tables(args.products, args.data_dir)
+    trader = Trader()
+    if set(data) != set(trader.strategies):
+        trader = StrategyTrader(*(s for p, s in trader.strategies.items() if p in data))
+    start = time.perf_counter()
+    result = MatchingSimulator(trader, data, trades, args.latency, args.maker_fee, args.taker_fee).run()
+    elapsed = time.perf_counter() - start
+    print(f"{len(result.timestamps)} ticks in {elapsed:.2f}s")
+    for key, value in result.summary().items():
+        print(f"{key:>13}: {value}")
+    print(f"    positions: {result.positions}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""Integer-tick order prices and a struct-of-arrays order batch.
+
+Exchanges only accept whole-tick prices, so fractional fair values must be
+rounded explicitly and on the passive side: ``bid_tick`` floors (never bid
+above the computed price) and ``ask_tick`` ceils (never offer below it).
+
+``OrderBatch`` holds orders as three preallocated ``int64`` columns
+(product index, price, signed quantity) for offline code that handles many
+orders at once; a fractional price or quantity fails loudly in ``add``
+instead of reaching the exchange (integral floats, as in books read with
+pandas, are taken as the whole number they are).  ``Trader.run`` does not
+copy its ``Order`` lists into a batch: the risk checks read them directly.
+"""
+import math
+import operator
+
+import numpy as np
+
+
+def bid_tick(price):
+    return math.floor(price)
+
+
+def ask_tick(price):
+    return math.ceil(price)
+
+
+def _whole(value, what, hint):
+    """``value`` as an int; integral floats (books keyed by float prices) are accepted."""
+    try:
+        return operator.index(value)
+    except TypeError:
+        pass
+    try:
+        if value == int(value):
+            return int(value)
+    except (TypeError, ValueError, OverflowError):
+        pass
+    raise TypeError(f"{what} {value!r} is not a whole number; {hint}")
+
+
+class OrderBatch:
+    __slots__ = ("products", "index", "product", "price", "quantity", "size")
+
+    def __init__(self, products, capacity=64):
+        self.products = tuple(products)
+        self.index = {product: i for i, product in enumerate(self.products)}
+        self.product = np.zeros(capacity, dtype=np.int64)
+        self.price = np.zeros(capacity, dtype=np.int64)
+        self.quantity = np.zeros(capacity, dtype=np.int64)
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    def clear(self):
+        self.size = 0
+
+    def _grow(self):
+        capacity = 2 * len(self.price)
+        for name in ("product", "price", "quantity"):
+            column = np.zeros(capacity, dtype=np.int64)
+            column[:self.size] = getattr(self, name)[:self.size]
+            setattr(self, name, column)
+
+    def add(self, product, price, quantity):
+        price = _whole(price, f"{product} order price", "round it with bid_tick/ask_tick")
+        quantity = _whole(quantity, f"{product} order quantity", "orders are in whole units")
+        i = self.size
+        if i == len(self.price):
+            self._grow()
+        self.product[i] = self.index[product]
+        self.price[i] = price
+        self.quantity[i] = quantity
+        self.size = i + 1
+
+    def fill(self, result):
+        """Replace the batch contents with a ``{product: [Order, ...]}`` tick."""
+        self.size = 0
+        for product, orders in result.items():
+            for order in orders:
+                self.add(product, order.price, order.quantity)
+
+    def columns(self):
+        """``(product, price, quantity)`` views of the filled part of the batch."""
+        n = self.size
+        return self.product[:n], self.price[:n], self.quantity[:n]
+
+    def to_orders(self, order_cls):
+        """``{product: [order_cls(product, price, quantity), ...]}`` for exchange APIs that want objects."""
+        result = {}
+        products = self.products
+        for p, price, quantity in zip(*(column.tolist() for column in self.columns())):
+            product = products[p]
+            result.setdefault(product, []).append(order_cls(product, price, quantity))
+        return result
@@ -0,0 +1,93 @@
+"""Quote persistence between ``Trader.run`` and the exchange.
+
+Strategies return their full desired order set every tick, mostly the same
+quotes as last tick.  ``OrderManager`` keeps the live set per product and
+diffs each new request against it:
+
+* an order identical (price and quantity) to a live one keeps the live
+  ``Order`` object and produces no action,
+* a changed order on the same side as a no-longer-wanted live one becomes an
+  ``amend`` of it,
+* anything left over is a ``new`` or a ``cancel``.
+
+``reconcile`` returns the live set to hand on (the previous list object
+itself when nothing changed), and the tick's ``actions`` are what a gateway
+would actually send.  A product with live quotes that is missing from a
+tick's result (no book, so no strategy ran for it) has them cancelled.
+
+It belongs to whatever sends orders to an exchange with resting quotes,
+fed each tick's ``Trader.run`` result.  ``Trader.run`` does not call it:
+the backtesters and the matching simulator take the full order set every
+tick, so the diff would be per-tick work nothing reads.
+"""
+from collections import namedtuple
+
+OrderAction = namedtuple("OrderAction", "kind product old new")
+
+
+class OrderManager:
+    def __init__(self):
+        self.live = {}
+        self.actions = []
+        self.counts = {"new": 0, "amend": 0, "cancel": 0, "kept": 0}
+
+    def reconcile(self, product, orders):
+        """Diff ``orders`` against the live quotes of ``product``; returns the new live list."""
+        live = self.live.get(product, [])
+        if len(orders) == len(live):
+            # common case: the same quotes in the same order
+            for order, old in zip(orders, live):
+                if order.price != old.price or order.quantity != old.quantity:
+                    break
+            else:
+                self.counts["kept"] += len(live)
+                return live
+
+        pool = {}
+        for order in live:
+            pool.setdefault((order.price, order.quantity), []).append(order)
+        result = []
+        fresh = []
+        for order in orders:
+            same = pool.get((order.price, order.quantity))
+            if same:
+                result.append(same.pop())
+            else:
+                result.append(order)
+                fresh.append(order)
+        kept = len(result) - len(fresh)
+        self.counts["kept"] += kept
+        if not fresh and kept == len(live):
+            return live
+
+        stale = [order for orders_at in pool.values() for order in orders_at]
+        actions = self.actions
+        for order in fresh:
+            buy = order.quantity > 0
+            for i, old in enumerate(stale):
+                if (old.quantity > 0) == buy:
+                    del stale[i]
+                    actions.append(OrderAction("amend", product, old, order))
+                    self.counts["amend"] += 1
+                    break
+            else:
+                actions.append(OrderAction("new", product, None, order))
+                self.counts["new"] += 1
+        for old in stale:
+            actions.append(OrderAction("cancel", product, old, None))
+        self.counts["cancel"] += len(stale)
+        self.live[product] = result
+        return result
+
+    def reconcile_all(self, result):
+        """Reconcile a whole ``{product: orders}`` tick; ``actions`` then holds this tick's actions.
+
+        Live products missing from ``result`` are reconciled against no orders
+        and come back with an empty list.
+        """
+        self.actions = []
+        reconciled = {product: self.reconcile(product, orders) for product, orders in result.items()}
+        for product, live in self.live.items():
+            if live and product not in reconciled:
+                reconciled[product] = self.reconcile(product, [])
+        return reconciled
@@ -0,0 +1,199 @@
+"""Pairs signals for products that move together (LUXRAY, JOLTEON, SHINX).
+
+Online, ``PairSignal`` fits ``y ~ alpha + beta * x`` by recursive least
+squares with exponential forgetting (the steady-state form of a Kalman
+filter on a random-walk hedge ratio), so each tick costs a handful of float
+operations and old data fades out instead of being refit.  The spread is the
+one-step-ahead residual, scored with a rolling z-score.  ``PairsEngine``
+updates every pair once per tick and strategies subscribe to the pairs that
+involve their product; ``PairSignal.reading`` freezes a pair's outputs for
+strategies in worker processes.
+
+Offline, ``cointegration`` runs an Engle-Granger test on every pair of full
+price files at once with NumPy:
+
+    python -m tradebotx.pairs LUXRAY JOLTEON SHINX
+"""
+import math
+from itertools import combinations
+
+import numpy as np
+
+from tradebotx.indicators import RollingStats
+
+PAIRS = (("LUXRAY", "JOLTEON"), ("LUXRAY", "SHINX"), ("JOLTEON", "SHINX"))
+
+# Engle-Granger 5% critical value for two series (MacKinnon, large sample)
+CRITICAL_5PCT = -3.34
+
+
+class PairReading:
+    """One tick's outputs of a ``PairSignal``; ``zscore`` is ``None`` until ready."""
+    __slots__ = ("y", "x", "ready", "spread", "hedge_ratio", "zscore")
+
+    def __init__(self, y, x, ready, spread, hedge_ratio, zscore):
+        self.y = y
+        self.x = x
+        self.ready = ready
+        self.spread = spread
+        self.hedge_ratio = hedge_ratio
+        self.zscore = zscore
+
+    def zscore_for(self, product):
+        return self.zscore if product == self.y else -self.zscore
+
+
+class PairSignal:
+    """Online hedge ratio of ``y`` on ``x`` and the z-score of their spread.
+
+    ``forgetting`` close to 1 gives a long memory (effective window of about
+    ``1 / (1 - forgetting)`` ticks).  ``x`` is measured from its first value
+    so the 2x2 covariance stays well conditioned at price levels in the
+    thousands.
+    """
+
+    def __init__(self, y, x, window=200, forgetting=0.999, delta=1000.0):
+        self.y = y
+        self.x = x
+        self.forgetting = forgetting
+        self.stats = RollingStats(window)
+        self.alpha = 0.0
+        self.beta = 0.0
+        self.spread = None
+        self._x0 = None
+        # symmetric inverse-information matrix [[p00, p01], [p01, p11]]
+        self._p00 = self._p11 = delta
+        self._p01 = 0.0
+
+    def update(self, y_price, x_price):
+        if self._x0 is None:
+            self._x0 = x_price
+            self.alpha = y_price
+        dx = x_price - self._x0
+        error = y_price - self.alpha - self.beta * dx
+        g0 = self._p00 + self._p01 * dx
+        g1 = self._p01 + self._p11 * dx
+        denom = self.forgetting + g0 + g1 * dx
+        k0, k1 = g0 / denom, g1 / denom
+        self.alpha += k0 * error
+        self.beta += k1 * error
+        scale = 1.0 / self.forgetting
+        self._p00 = (self._p00 - k0 * g0) * scale
+        self._p01 = (self._p01 - k0 * g1) * scale
+        self._p11 = (self._p11 - k1 * g1) * scale
+        self.spread = error
+        self.stats.update(error)
+
+    @property
+    def hedge_ratio(self):
+        return self.beta
+
+    @property
+    def ready(self):
+        return self.stats.full
+
+    @property
+    def zscore(self):
+        """Positive when ``y`` is rich relative to ``beta * x``."""
+        return self.stats.zscore(self.spread)
+
+    def zscore_for(self, product):
+        """Spread z-score signed so that positive means ``product`` is the rich leg."""
+        return self.zscore if product == self.y else -self.zscore
+
+    def reading(self):
+        ready = self.ready
+        return PairReading(self.y, self.x, ready, self.spread, self.beta, self.zscore if ready else None)
+
+
+class PairsEngine:
+    def __init__(self, pairs=PAIRS, **kwargs):
+        self.signals = [PairSignal(y, x, **kwargs) for y, x in pairs]
+        self._mids = {}
+
+    def update(self, books):
+        """Refresh every pair from this tick's ``{product: BookView}``; stale legs keep their last mid."""
+        for product, book in books.items():
+            if book.mid is not None:
+                self._mids[product] = book.mid
+        mids = self._mids
+        for signal in self.signals:
+            if signal.y in mids and signal.x in mids:
+                signal.update(mids[signal.y], mids[signal.x])
+
+    def subscriptions(self, product):
+        return [signal for signal in self.signals if product in (signal.y, signal.x)]
+
+
+def aligned_mids(tables):
+    """Mid prices of several products on their common timestamps, as a ``(T, N)`` array."""
+    common = None
+    for table in tables:
+        ts = table["timestamp"]
+        common = ts if common is None else np.intersect1d(common, ts, assume_unique=True)
+    columns = []
+    for table in tables:
+        rows = np.searchsorted(table["timestamp"], common)
+        columns.append((table["bid_price_1"][rows] + table["ask_price_1"][rows]) / 2)
+    mids = np.column_stack(columns)
+    return mids[~np.isnan(mids).any(axis=1)]
+
+
+def cointegration(mids, names):
+    """Engle-Granger test of every ordered pair of columns of ``mids``.
+
+    Returns dicts sorted by ADF t-statistic (most negative, i.e. most
+    mean-reverting, first) with the OLS hedge ratio and the spread's
+    half-life in ticks.
+    """
+    mids = np.asarray(mids, dtype=np.float64)
+    centered = mids - mids.mean(axis=0)
+    cov = centered.T @ centered
+    pairs = [(i, j) for i, j in combinations(range(len(names)), 2)]
+    pairs += [(j, i) for i, j in pairs]
+    ys = np.array([i for i, _ in pairs])
+    xs = np.array([j for _, j in pairs])
+    beta = cov[ys, xs] / cov[xs, xs]
+    alpha = mids[:, ys].mean(axis=0) - beta * mids[:, xs].mean(axis=0)
+    spread = centered[:, ys] - beta * centered[:, xs]
+
+    lagged, change = spread[:-1], np.diff(spread, axis=0)
+    ss = (lagged * lagged).sum(axis=0)
+    gamma = (lagged * change).sum(axis=0) / ss
+    resid = change - gamma * lagged
+    se = np.sqrt((resid * resid).sum(axis=0) / (len(change) - 1) / ss)
+    tstat = gamma / se
+    half_life = np.full(len(pairs), np.inf)
+    reverting = gamma < 0
+    # gamma <= -1 means the spread fully reverts within a tick
+    half_life[reverting] = -math.log(2) / np.log1p(np.maximum(gamma[reverting], -1 + 1e-9))
+
+    rows = [{
+        "y": names[i], "x": names[j], "beta": float(beta[k]), "alpha": float(alpha[k]),
+        "adf_t": float(tstat[k]), "half_life": float(half_life[k]),
+        "cointegrated": bool(tstat[k] < CRITICAL_5PCT),
+    } for k, (i, j) in enumerate(pairs)]
+    return sorted(rows, key=lambda row: row["adf_t"])
+
+
+def main(argv=None):
+    import argparse
+
+    from tradebotx.tickstore import DATA_DIR, load_prices
+
+    parser = argparse.ArgumentParser(description="Engle-Granger cointegration search over price files")
+    parser.add_argument("products", nargs="*", default=["LUXRAY", "JOLTEON", "SHINX"])
+    parser.add_argument("--data-dir", default=DATA_DIR)
+    args = parser.parse_args(argv)
+
+    mids = aligned_mids([load_prices(product, args.data_dir) for product in args.products])
+    print(f"{len(mids)} common ticks")
+    print(f"{'y':<10}{'x':<10}{'beta':>10}{'adf t':>10}{'half-life':>11}")
+    for row in cointegration(mids, args.products):
+        flag = "  *" if row["cointegrated"] else ""
+        print(f"{row['y']:<10}{row['x']:<10}{row['beta']:>10.4f}{row['adf_t']:>10.2f}"
+              f"{row['half_life']:>11.1f}{flag}")
+
+
+if __name__ == "__main__":
+    main()
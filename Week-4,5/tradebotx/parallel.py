@@ -0,0 +1,137 @@
+"""Concurrent per-product strategy execution.
+
+Each worker process owns the strategies of a fixed set of products for the
+whole session, so strategy state never crosses a process boundary; per tick
+only the relevant books and positions go out and the orders come back.  All
+workers are sent their tick before any reply is read, so they run in
+parallel, and replies are merged in ``state.order_depth`` order, giving the
+same result dict as serial execution.
+
+Strategies run in their worker with a ``TickState`` carrying the
+timestamp, positions and market trades, through an ``EventDispatcher`` as in
+the parent.  Signals that need other products' books (basket and pairs
+readings, fair values) are computed once in the parent and shipped per
+tick as ``signals``, ``{product: {attribute: value}}``, which the worker
+sets on the strategy before it runs.  The trade tape only needs a product's
+own trades and book, so with ``tape=True`` each worker keeps a
+``TapeEngine`` for its products.  Process round trips cost
+tens of microseconds, so it pays off once the strategies' combined per-tick
+time exceeds that; ``tradebotx.bench`` shows where a configuration stands.
+"""
+import multiprocessing
+import traceback
+
+from tradebotx.book import BookView
+from tradebotx.events import EventDispatcher
+from tradebotx.tape import TapeEngine
+
+
+class TickState:
+    __slots__ = ("timestamp", "positions", "market_trades")
+
+    def __init__(self, timestamp, positions, market_trades=None):
+        self.timestamp = timestamp
+        self.positions = positions
+        self.market_trades = market_trades or {}
+
+
+def _worker_main(conn, classes, tape):
+    strategies = {product: cls() for product, cls in classes.items()}
+    tape = TapeEngine(tuple(strategies)) if tape else None
+    if tape is not None:
+        for product, strategy in strategies.items():
+            strategy.tape = tape.features[product]
+    events = EventDispatcher(strategies)
+    while True:
+        message = conn.recv()
+        if message is None:
+            break
+        timestamp, books, positions, trades, signals = message
+        try:
+            books = {product: BookView(buy, sell) for product, (buy, sell) in books.items()}
+            for product, attributes in signals.items():
+                strategy = strategies[product]
+                for name, value in attributes.items():
+                    setattr(strategy, name, value)
+            if tape is not None:
+                tape.update(trades, books)
+            result = events.dispatch(TickState(timestamp, positions, trades), books, positions)
+            conn.send(("ok", result))
+        except Exception:
+            conn.send(("error", traceback.format_exc()))
+    conn.close()
+
+
+class ProductWorkerPool:
+    """Persistent worker processes with strategies pinned per product.
+
+    ``classes`` maps product to a strategy class; each worker instantiates
+    its own products' strategies once at start-up.
+    """
+
+    def __init__(self, classes, workers=None, tape=False):
+        workers = max(1, min(workers or multiprocessing.cpu_count(), len(classes)))
+        try:
+            context = multiprocessing.get_context("fork")
+        except ValueError:
+            context = multiprocessing.get_context()
+        self.owner = {}
+        assignments = [{} for _ in range(workers)]
+        for i, (product, cls) in enumerate(classes.items()):
+            assignments[i % workers][product] = cls
+            self.owner[product] = i % workers
+        self._conns = []
+        self._procs = []
+        for assigned in assignments:
+            parent, child = context.Pipe()
+            proc = context.Process(target=_worker_main, args=(child, assigned, tape), daemon=True)
+            proc.start()
+            child.close()
+            self._conns.append(parent)
+            self._procs.append(proc)
+
+    def run(self, state, signals=None):
+        """``{product: orders}`` for ``state``; ``signals[product]`` is set on that product's strategy first."""
+        positions = dict(getattr(state, "positions", {}))
+        trades = getattr(state, "market_trades", None) or {}
+        signals = signals or {}
+        batches = [({}, {}, {}) for _ in self._conns]
+        for product, orderbook in state.order_depth.items():
+            books, batch_trades, batch_signals = batches[self.owner[product]]
+            books[product] = (orderbook.buy_orders, orderbook.sell_orders)
+            if trades.get(product):
+                batch_trades[product] = trades[product]
+            if product in signals:
+                batch_signals[product] = signals[product]
+        busy = []
+        timestamp = getattr(state, "timestamp", None)
+        for worker, (books, batch_trades, batch_signals) in enumerate(batches):
+            if books:
+                self._conns[worker].send((timestamp, books, positions, batch_trades, batch_signals))
+                busy.append(worker)
+        merged = {}
+        for worker in busy:
+            status, payload = self._conns[worker].recv()
+            if status != "ok":
+                raise RuntimeError(f"strategy worker {worker} failed:\n{payload}")
+            merged.update(payload)
+        return {product: merged[product] for product in state.order_depth}
+
+    def close(self):
+        for conn in self._conns:
+            try:
+                conn.send(None)
+            except (BrokenPipeError, OSError):
+                pass
+        for proc in self._procs:
+            proc.join(timeout=5)
+        for conn in self._conns:
+            conn.close()
+        self._conns = []
+        self._procs = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
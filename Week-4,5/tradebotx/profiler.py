@@ -0,0 +1,133 @@
+"""Low-overhead latency instrumentation for ``Trader.run``.
+
+``Trader.run`` brackets each product's ``get_orders`` with ``begin``/``end``
+and strategies mark sub-spans with ``lap`` (e.g. after updating indicators).
+Durations go into log-bucketed histograms, so recording is O(1) and memory
+stays fixed however long the run.  A disabled profiler turns every call into
+a single attribute check, cheap enough to leave wired in for live runs.
+"""
+import time
+
+_SUB_BUCKETS = 4  # per power of two: ~19% bucket width
+
+
+class LatencyHistogram:
+    """Nanosecond durations in log2 buckets with exact count, mean and max."""
+
+    __slots__ = ("counts", "count", "total", "max")
+
+    def __init__(self):
+        self.counts = [0] * (64 * _SUB_BUCKETS)
+        self.count = 0
+        self.total = 0
+        self.max = 0
+
+    def record(self, ns):
+        if ns < _SUB_BUCKETS:
+            index = max(ns, 0)
+        else:
+            bits = ns.bit_length()
+            index = bits * _SUB_BUCKETS + ((ns >> (bits - 3)) & (_SUB_BUCKETS - 1))
+        self.counts[index] += 1
+        self.count += 1
+        self.total += ns
+        if ns > self.max:
+            self.max = ns
+
+    @staticmethod
+    def _upper(index):
+        if index < _SUB_BUCKETS:
+            return index
+        bits, sub = divmod(index, _SUB_BUCKETS)
+        return ((_SUB_BUCKETS + sub + 1) << (bits - 3)) - 1
+
+    def percentile(self, q):
+        """Upper edge of the bucket holding the ``q`` quantile (capped at the true max)."""
+        if not self.count:
+            return 0
+        target = q * self.count
+        seen = 0
+        for index, n in enumerate(self.counts):
+            seen += n
+            if n and seen >= target:
+                return min(self._upper(index), self.max)
+        return self.max
+
+    def summary(self):
+        return {
+            "count": self.count,
+            "mean_us": self.total / self.count / 1e3 if self.count else 0.0,
+            "p50_us": self.percentile(0.50) / 1e3,
+            "p99_us": self.percentile(0.99) / 1e3,
+            "max_us": self.max / 1e3,
+        }
+
+
+class Profiler:
+    """Per-product and per-span latency histograms, optionally with cProfile."""
+
+    def __init__(self, enabled=True, cprofile=False):
+        self.enabled = enabled
+        self.histograms = {}
+        self._key = None
+        self._start = 0
+        self._last = 0
+        self._cprofile = None
+        if enabled and cprofile:
+            import cProfile
+
+            self._cprofile = cProfile.Profile()
+            self._cprofile.enable()
+
+    def __reduce__(self):
+        # timings are per process: a pickled profiler comes back disabled
+        return Profiler, (False,)
+
+    def record(self, name, ns):
+        if not self.enabled:
+            return
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            histogram = self.histograms[name] = LatencyHistogram()
+        histogram.record(ns)
+
+    def begin(self, key):
+        if self.enabled:
+            self._key = key
+            self._start = self._last = time.perf_counter_ns()
+
+    def lap(self, name):
+        """Close a sub-span of the current key, e.g. ``lap("indicators")``."""
+        if self.enabled and self._key is not None:
+            now = time.perf_counter_ns()
+            self.record(f"{self._key}.{name}", now - self._last)
+            self._last = now
+
+    def end(self, rest="orders"):
+        """Close the current key; time since the last lap is recorded as ``rest``."""
+        if self.enabled and self._key is not None:
+            now = time.perf_counter_ns()
+            if self._last != self._start:
+                self.record(f"{self._key}.{rest}", now - self._last)
+            self.record(self._key, now - self._start)
+            self._key = None
+
+    def summary(self):
+        return {name: hist.summary() for name, hist in sorted(self.histograms.items())}
+
+    def report(self):
+        lines = [f"{'span':<24}{'count':>9}{'mean us':>10}{'p50 us':>10}{'p99 us':>10}{'max us':>10}"]
+        for name, s in self.summary().items():
+            lines.append(f"{name:<24}{s['count']:>9}{s['mean_us']:>10.2f}{s['p50_us']:>10.2f}"
+                         f"{s['p99_us']:>10.2f}{s['max_us']:>10.2f}")
+        return "\n".join(lines)
+
+    def dump(self, path):
+        """Write the cProfile stats (for snakeviz, flameprof, ``pstats``) to ``path``."""
+        if self._cprofile is None:
+            raise RuntimeError("profiler was created without cprofile=True")
+        self._cprofile.disable()
+        self._cprofile.dump_stats(path)
+
+
+NULL_PROFILER = Profiler(enabled=False)
@@ -0,0 +1,168 @@
+"""Sharded parallel replay of a long history.
+
+The timeline is cut into contiguous sessions (fixed-length days with
+``day_length``, otherwise ``shards`` equal pieces).  Each shard runs in its
+own worker process: a fresh trader is warmed up from the ``warmup_ticks``
+rows before the shard (``tradebotx.warmup``), replayed through
+``Backtester`` over the shard's rows, and the per-shard results are
+stitched into one report whose PnL curve carries each shard's final PnL
+into the next.  Workers memory-map the same tick store, so only the results
+travel between processes and wall-clock time falls with the core count.
+
+Divergence from one sequential run.  The first shard has no rows before it,
+so it is the sequential run over its rows exactly.  Every later shard starts
+from a fresh trader in which:
+
+* Indicators match up to float error: the ``RollingStats``, ``RSI`` and
+  ``PriceHistory`` windows (all shorter than ``warmup_ticks``) hold the same
+  mids as the sequential run's when every warm-up row has a two-sided book,
+  and the baskets' premium statistics are replayed from the same tops of
+  book.  EMAs miss only the weight before the warm-up window, a relative
+  error of at most ``(1 - 2 / 27) ** warmup_ticks`` (below 1e-33 for the
+  default 1000 ticks) for the slowest, the EMA-26.
+* The pairs hedge ratios restart from the warm-up window, so their
+  ``forgetting ** warmup_ticks`` (about 37%) older weight is lost and their
+  z-scores differ from the sequential ones for a while after the boundary.
+* Some state restarts cold: the trade-tape windows with ``tape=True``,
+  SUDOWOODO's ``OnlineFairValue`` with ``fair_values=True`` (back at its
+  10000 prior), and the risk engine's marked PnL, so loss limits count from
+  zero again in every shard.
+* Inventory: every shard starts flat, i.e. the merged run is the
+  sequential run with the position closed at mid, for free, at each
+  boundary, and with position-dependent state (entry prices) reset.
+  ``ShardedResult.carried`` lists the position dropped at each boundary.
+
+So a later shard matches the sequential run only approximately: decisions
+can differ through the pairs z-scores, through any cold state the trader is
+configured to use, and, where ``carried`` is not all zeros, until both runs
+are flat again.  ``--compare`` reports the resulting PnL difference.
+
+    python -m tradebotx.shards --shards 8 --workers 8
+    python -m tradebotx.shards --day-length 1000000
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from tradebotx.backtest import Backtester, BacktestResult
+from tradebotx.tickstore import DATA_DIR, PRODUCTS, load_all
+from tradebotx.warmup import WARMUP_TICKS
+
+
+class ShardedResult(BacktestResult):
+    def __init__(self, timestamps, pnl_curve, positions, cash, turnover, fills, boundaries, carried):
+        super().__init__(timestamps, pnl_curve, positions, cash, turnover, fills)
+        # first timestamp of every shard after the first, and the positions dropped there
+        self.boundaries = boundaries
+        self.carried = carried
+
+    def summary(self):
+        summary = super().summary()
+        summary.update(shards=len(self.boundaries) + 1,
+                       carried=sum(abs(q) for positions in self.carried for q in positions.values()))
+        return summary
+
+
+def session_starts(timestamps, shards=None, day_length=None):
+    """First timestamp of every shard: day boundaries with ``day_length``, else ``shards`` equal pieces."""
+    timestamps = np.asarray(timestamps)
+    if not len(timestamps):
+        return []
+    if day_length:
+        days = timestamps // day_length
+        first = np.flatnonzero(np.diff(days)) + 1
+        return [timestamps[0].item()] + timestamps[first].tolist()
+    shards = max(1, min(shards or os.cpu_count(), len(timestamps)))
+    rows = np.linspace(0, len(timestamps), shards + 1).astype(np.int64)[:-1]
+    return timestamps[np.unique(rows)].tolist()
+
+
+def run_shard(trader_cls, products, data_dir, start, stop, warmup_ticks=WARMUP_TICKS):
+    """Warm a fresh ``trader_cls()`` from the rows before ``start`` and replay ``[start, stop)``."""
+    data = {}
+    for product, table in load_all(products, data_dir).items():
+        rows = table.between(start, stop if stop is not None else np.inf)
+        if len(rows):
+            data[product] = rows
+    trader = trader_cls()
+    if warmup_ticks and hasattr(trader, "warm_up"):
+        trader.warm_up(budget=float("inf"), ticks=warmup_ticks, data_dir=data_dir, before=start)
+    try:
+        return Backtester(trader, data).run()
+    finally:
+        if hasattr(trader, "close"):
+            trader.close()
+
+
+def merge(results):
+    """One continuous ``ShardedResult`` from consecutive shard results."""
+    offset = 0.0
+    curves = []
+    turnover = fills = 0
+    for result in results:
+        curves.append(result.pnl_curve + offset)
+        offset += result.pnl
+        turnover += result.turnover
+        fills += result.fills
+    last = results[-1]
+    # everything before the last shard was booked as cash at its closing mids
+    cash = offset - last.pnl + last.cash
+    return ShardedResult(np.concatenate([r.timestamps for r in results]), np.concatenate(curves),
+                         dict(last.positions), cash, turnover, fills,
+                         [r.timestamps[0].item() for r in results[1:]],
+                         [dict(r.positions) for r in results[:-1]])
+
+
+def replay(trader_cls, products=PRODUCTS, data_dir=DATA_DIR, shards=None, day_length=None,
+           workers=None, warmup_ticks=WARMUP_TICKS):
+    """Replay the whole history in shards across ``workers`` processes; returns a ``ShardedResult``."""
+    data = load_all(products, data_dir)
+    timestamps = np.unique(np.concatenate([table["timestamp"] for table in data.values()]))
+    starts = session_starts(timestamps, shards, day_length)
+    stops = starts[1:] + [None]
+    jobs = [(trader_cls, tuple(products), data_dir, start, stop, warmup_ticks)
+            for start, stop in zip(starts, stops)]
+    if workers == 1 or len(jobs) == 1:
+        return merge([run_shard(*job) for job in jobs])
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+        futures = [pool.submit(run_shard, *job) for job in jobs]
+        return merge([future.result() for future in futures])
+
+
+def main(argv=None):
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description="Replay the history in parallel shards")
+    parser.add_argument("products", nargs="*", default=list(PRODUCTS))
+    parser.add_argument("--data-dir", default=DATA_DIR)
+    parser.add_argument("--shards", type=int, help="equal pieces (default: one per core)")
+    parser.add_argument("--day-length", type=int, help="split at multiples of this many timestamp units")
+    parser.add_argument("--workers", type=int)
+    parser.add_argument("--warmup-ticks", type=int, default=WARMUP_TICKS)
+    parser.add_argument("--compare", action="store_true", help="also run sequentially and report the difference")
+    args = parser.parse_args(argv)
+
+    from Strategy_24B2184 import Trader
+
+    start = time.perf_counter()
+    result = replay(Trader, args.products, args.data_dir, args.shards, args.day_length, args.workers,
+                    args.warmup_ticks)
+    elapsed = time.perf_counter() - start
+    print(f"{len(result.timestamps)} ticks in {len(result.boundaries) + 1} shards in {elapsed:.2f}s")
+    for key, value in result.summary().items():
+        print(f"{key:>13}: {value}")
+    print(f"    positions: {result.positions}")
+    if args.compare:
+        start = time.perf_counter()
+        trader = Trader()
+        sequential = Backtester(trader, load_all(args.products, args.data_dir)).run()
+        trader.close()
+        print(f"sequential in {time.perf_counter() - start:.2f}s: pnl {sequential.pnl}, "
+              f"difference {result.pnl - sequential.pnl:+.1f}, "
+              f"max curve gap {np.max(np.abs(result.pnl_curve - sequential.pnl_curve)):.1f}")
+
+
+if __name__ == "__main__":
+    main()
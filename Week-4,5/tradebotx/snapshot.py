@@ -0,0 +1,127 @@
+"""One consistent per-tick view of every product's book, and its history.
+
+``Trader.run`` builds a ``MarketSnapshot`` each tick: one read-only
+``(field, product)`` float array holding the best bid/ask, mid, spread, top
+volumes and position of all products, with a row view per field
+(``snapshot.mid[snapshot.index["LUXRAY"]]``).  Missing sides are NaN.
+``SnapshotHistory`` keeps the last ``capacity`` snapshots column-wise so a
+field's recent history for one or all products is a zero-copy slice.
+With ``capacity=0`` it only keeps ``latest``, which is all ``Trader`` needs
+while no strategy reads past snapshots: copying every tick into a 1000 row
+history was per-tick work nobody used.
+"""
+import numpy as np
+
+from tradebotx.tickstore import PRODUCTS
+
+FIELDS = ("bid", "ask", "mid", "spread", "bid_volume", "ask_volume", "position")
+_NAN = float("nan")
+
+
+class MarketSnapshot:
+    __slots__ = ("timestamp", "products", "index", "data") + FIELDS
+
+    def __init__(self, timestamp, products, index, data):
+        data.flags.writeable = False
+        set_ = object.__setattr__
+        set_(self, "timestamp", timestamp)
+        set_(self, "products", products)
+        set_(self, "index", index)
+        set_(self, "data", data)
+        for row, field in enumerate(FIELDS):
+            set_(self, field, data[row])
+
+    def __setattr__(self, name, value):
+        raise AttributeError("MarketSnapshot is immutable")
+
+    def __reduce__(self):
+        return MarketSnapshot, (self.timestamp, self.products, self.index, self.data.copy())
+
+    @classmethod
+    def build(cls, timestamp, books, positions, products=PRODUCTS, index=None):
+        """Snapshot of ``{product: BookView}``; products without a book are all NaN."""
+        values = []
+        extend = values.extend
+        for product in products:
+            book = books.get(product)
+            position = positions.get(product, 0)
+            if book is None:
+                extend((_NAN, _NAN, _NAN, _NAN, _NAN, _NAN, position))
+                continue
+            bid = _NAN if book.best_bid is None else book.best_bid
+            ask = _NAN if book.best_ask is None else book.best_ask
+            extend((bid, ask, (bid + ask) / 2, ask - bid, book.bid_volume, book.ask_volume, position))
+        data = np.array(values, dtype=np.float64).reshape(len(products), len(FIELDS)).T
+        if index is None:
+            index = {product: i for i, product in enumerate(products)}
+        return cls(timestamp, products, index, data)
+
+    def get(self, product, field):
+        return float(self.data[FIELDS.index(field), self.index[product]])
+
+
+class SnapshotHistory:
+    """The last ``capacity`` snapshots as per-field ``(tick, product)`` columns.
+
+    Like ``PriceHistory`` every row is written twice, so any recent window
+    is one contiguous slice.  ``capacity=0`` keeps no history, only ``latest``.
+    """
+
+    def __init__(self, capacity, products=PRODUCTS):
+        if capacity < 0:
+            raise ValueError("capacity must not be negative")
+        self.capacity = capacity
+        self.products = tuple(products)
+        self.index = {product: i for i, product in enumerate(self.products)}
+        self.count = 0
+        self.latest = None
+        self._buf = np.full((len(FIELDS), 2 * capacity, len(self.products)), np.nan)
+        self._timestamps = np.zeros(2 * capacity, dtype=np.int64)
+        self._head = 0
+
+    def build(self, timestamp, books, positions):
+        """Build this tick's snapshot, append it and return it."""
+        snapshot = MarketSnapshot.build(timestamp, books, positions, self.products, self.index)
+        self.append(snapshot)
+        return snapshot
+
+    def append(self, snapshot):
+        if not self.capacity:
+            self.count += 1
+            self.latest = snapshot
+            return
+        head = self._head
+        self._buf[:, head] = snapshot.data
+        self._buf[:, head + self.capacity] = snapshot.data
+        timestamp = snapshot.timestamp if snapshot.timestamp is not None else self.count
+        self._timestamps[head] = self._timestamps[head + self.capacity] = timestamp
+        head += 1
+        self._head = head if head < self.capacity else 0
+        self.count += 1
+        self.latest = snapshot
+
+    def __len__(self):
+        return min(self.count, self.capacity)
+
+    def _span(self, n):
+        size = len(self)
+        n = size if n is None else min(n, size)
+        end = self._head + self.capacity
+        return end - n, end
+
+    def field(self, name, n=None):
+        """Read-only ``(n, products)`` view of the last ``n`` ticks of one field."""
+        start, end = self._span(n)
+        view = self._buf[FIELDS.index(name), start:end]
+        view.flags.writeable = False
+        return view
+
+    def series(self, name, product, n=None):
+        """Read-only view of the last ``n`` values of one field for one product."""
+        return self.field(name, n)[:, self.index[product]]
+
+    def timestamps(self, n=None):
+        start, end = self._span(n)
+        view = self._timestamps[start:end]
+        view.flags.writeable = False
+        return view
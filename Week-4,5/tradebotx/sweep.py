@@ -0,0 +1,228 @@
+"""Parallel parameter sweeps for single-product strategies.
+
+Each parameter set is one independent backtest, so sweeps are fanned out over
+a process pool with one worker per core.  Every worker memory-maps the same
+tick store columns (``tradebotx.tickstore``), so the price data is shared
+read-only through the OS page cache instead of copied.  Finished rows are appended to a CSV as they arrive, and
+rerunning with the same output file skips parameter sets already in it.  Rows
+are keyed by the parameters and a ``run`` digest of everything else a result
+depends on: the strategy's source and the library code it runs
+(``walkforward.strategy_hash``), the product, the identity of its data files
+(path, size and modification time, as the tick store checks them) and the
+matching options, so changing any of those reruns every set.
+
+    python -m tradebotx.sweep AbraStrategy --grid z_threshold=1.5,2,2.5 lookback=100,200
+    python -m tradebotx.sweep JolteonStrategy --random rsi_low=25:40 z_threshold=1.2:2.5 -n 50
+
+``--latency`` (and the fee options) scores each set with the queue-aware
+``tradebotx.matching`` simulator instead of the immediate-fill backtester.
+"""
+import csv
+import hashlib
+import itertools
+import json
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from tradebotx.backtest import Backtester, StrategyTrader
+from tradebotx.matching import MatchingSimulator, load_trade_tables
+from tradebotx.tickstore import DATA_DIR, _source_meta, find_data_file, load_prices
+
+RESULT_FIELDS = ("pnl", "max_drawdown", "turnover", "fills")
+CSV_FIELDS = ("run", "params") + RESULT_FIELDS
+
+_DATA = {}
+_TRADES = {}
+
+
+def grid(**values):
+    """Every combination of the given per-parameter value lists."""
+    names = sorted(values)
+    return [dict(zip(names, combo)) for combo in itertools.product(*(values[n] for n in names))]
+
+
+def random_space(n, seed=0, **ranges):
+    """``n`` random parameter sets.
+
+    A range is either a list of choices or a ``(low, high)`` tuple, sampled as
+    integers when both bounds are ints and uniformly otherwise.
+    """
+    rng = random.Random(seed)
+    sets = []
+    for _ in range(n):
+        params = {}
+        for name in sorted(ranges):
+            spec = ranges[name]
+            if isinstance(spec, tuple):
+                low, high = spec
+                if isinstance(low, int) and isinstance(high, int):
+                    params[name] = rng.randint(low, high)
+                else:
+                    params[name] = rng.uniform(low, high)
+            else:
+                params[name] = rng.choice(list(spec))
+        sets.append(params)
+    return sets
+
+
+def params_key(params):
+    return json.dumps(params, sort_keys=True)
+
+
+def run_key(strategy_cls, product, data_dir=DATA_DIR, matching=None):
+    """Digest of what a result row depends on besides its parameters."""
+    # walkforward imports this module, so its strategy hash is imported on use
+    from tradebotx.walkforward import strategy_hash
+
+    sources = {}
+    for kind in ("price", "trade") if matching is not None else ("price",):
+        try:
+            sources[kind] = _source_meta(find_data_file(product, kind, data_dir))
+        except FileNotFoundError:
+            pass
+    raw = json.dumps({"strategy": strategy_hash(strategy_cls), "product": product, "data": sources,
+                      "matching": matching}, sort_keys=True)
+    return hashlib.sha256(raw.encode()).hexdigest()[:16]
+
+
+def _init_worker(product, data_dir):
+    if product not in _DATA:
+        _DATA[product] = load_prices(product, data_dir)
+        _TRADES.update(load_trade_tables([product], data_dir))
+
+
+def run_one(strategy_cls, product, params, data=None, matching=None):
+    """Backtest one parameter set and return its result row.
+
+    ``matching`` is a dict of ``MatchingSimulator`` options (``latency``,
+    ``maker_fee``, ``taker_fee``) to use that simulator instead.
+    """
+    strategy = strategy_cls().configure(**params)
+    product = product or strategy.product_name
+    data = data if data is not None else _DATA[product]
+    trader = StrategyTrader(strategy)
+    if matching is None:
+        result = Backtester(trader, {product: data}).run()
+    else:
+        trades = {product: _TRADES[product]} if product in _TRADES else {}
+        result = MatchingSimulator(trader, {product: data}, trades, **matching).run()
+    row = {"params": params_key(params)}
+    summary = result.summary()
+    row.update((key, summary[key]) for key in RESULT_FIELDS)
+    return row
+
+
+def _read_done(path, run):
+    """Rows of this ``run`` already in the CSV at ``path``, by parameters."""
+    if not path or not os.path.exists(path):
+        return {}
+    with open(path, newline="") as f:
+        reader = csv.DictReader(f)
+        if reader.fieldnames is not None and tuple(reader.fieldnames) != CSV_FIELDS:
+            raise ValueError(f"{path} has columns {reader.fieldnames}, expected {list(CSV_FIELDS)}; "
+                             "write to a new file")
+        return {row["params"]: row for row in reader if row["run"] == run}
+
+
+def _parse_row(row):
+    row = dict(row)
+    row.pop("run", None)
+    for key in RESULT_FIELDS:
+        value = float(row[key])
+        row[key] = int(value) if key in ("turnover", "fills") else value
+    return row
+
+
+def sweep(strategy_cls, param_sets, product=None, data_dir=DATA_DIR, workers=None,
+          out_path=None, matching=None):
+    """Backtest every parameter set in ``param_sets``; returns rows sorted by PnL.
+
+    With ``out_path`` each finished row is appended to that CSV immediately,
+    and parameter sets already present there for the same ``run_key`` are not
+    run again.
+    """
+    product = product or strategy_cls().product_name
+    run = run_key(strategy_cls, product, data_dir, matching)
+    done = _read_done(out_path, run)
+    todo = [p for p in param_sets if params_key(p) not in done]
+    rows = [_parse_row(row) for row in done.values()]
+
+    _init_worker(product, data_dir)
+    writer = None
+    out = None
+    if out_path:
+        new_file = not os.path.exists(out_path) or not os.path.getsize(out_path)
+        out = open(out_path, "a", newline="")
+        writer = csv.DictWriter(out, fieldnames=CSV_FIELDS)
+        if new_file:
+            writer.writeheader()
+    try:
+        with ProcessPoolExecutor(max_workers=workers or os.cpu_count(),
+                                 initializer=_init_worker, initargs=(product, data_dir)) as pool:
+            futures = [pool.submit(run_one, strategy_cls, product, p, None, matching)
+                       for p in todo]
+            for future in as_completed(futures):
+                row = future.result()
+                rows.append(row)
+                if writer:
+                    writer.writerow(dict(row, run=run))
+                    out.flush()
+    finally:
+        if out:
+            out.close()
+    rows.sort(key=lambda row: row["pnl"], reverse=True)
+    return rows
+
+
+def parse_value(text):
+    for cast in (int, float):
+        try:
+            return cast(text)
+        except ValueError:
+            pass
+    return text
+
+
+def main(argv=None):
+    import argparse
+    import importlib
+
+    parser = argparse.ArgumentParser(description="Parallel parameter sweep")
+    parser.add_argument("strategy", help="strategy class name in Strategy_24B2184")
+    parser.add_argument("--grid", nargs="*", default=[], metavar="NAME=V1,V2,...")
+    parser.add_argument("--random", nargs="*", default=[], metavar="NAME=LOW:HIGH")
+    parser.add_argument("-n", type=int, default=20, help="random samples")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--product")
+    parser.add_argument("--data-dir", default=DATA_DIR)
+    parser.add_argument("--workers", type=int)
+    parser.add_argument("--out", help="CSV of results; reused to resume")
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--latency", type=int, help="use the matching simulator with this latency (ticks)")
+    parser.add_argument("--maker-fee", type=float, default=0.0)
+    parser.add_argument("--taker-fee", type=float, default=0.0)
+    args = parser.parse_args(argv)
+
+    strategy_cls = getattr(importlib.import_module("Strategy_24B2184"), args.strategy)
+    if args.random:
+        ranges = {}
+        for item in args.random:
+            name, spec = item.split("=", 1)
+            ranges[name] = tuple(parse_value(v) for v in spec.split(":"))
+        param_sets = random_space(args.n, args.seed, **ranges)
+    else:
+        param_sets = grid(**{name: [parse_value(v) for v in spec.split(",")]
+                             for name, spec in (item.split("=", 1) for item in args.grid)})
+
+    matching = None
+    if args.latency is not None:
+        matching = {"latency": args.latency, "maker_fee": args.maker_fee, "taker_fee": args.taker_fee}
+    rows = sweep(strategy_cls, param_sets, args.product, args.data_dir, args.workers, args.out,
+                 matching=matching)
+    for row in rows[:args.top]:
+        print(f"{row['pnl']:>12.1f} {row['max_drawdown']:>12.1f} {row['turnover']:>8} {row['params']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,189 @@
+"""Streaming features of the market trade tape.
+
+``TradeFeatures`` keeps, over the last ``window`` ticks of one product's
+trades:
+
+* VWAP, volume and trade count (``intensity`` is trades per tick),
+* signed volume and its share of volume (``imbalance``, in [-1, 1]).  The
+  tape has no aggressor side, so trades are classified by the quote rule
+  against the mid of the book in force when they printed (the previous
+  tick's), and by the tick rule when they print at the mid or no book was
+  seen yet,
+* the size distribution, as counts per power-of-two size bucket.
+
+Per tick the window slides by one slot: the slot falling out is subtracted
+from running sums and the new tick's trades are added, so a tick costs O(1)
+plus O(1) per trade.  Bursts of ``BULK`` trades or more are aggregated with
+NumPy instead of per trade: below that, the per-call overhead of NumPy makes
+the plain loop faster.  The sums are recomputed from the window once per
+``window`` ticks so float error from the subtractions cannot build up.
+
+``TapeEngine`` updates every product once per tick from
+``state.market_trades`` (``{product: [(price, quantity), ...]}`` or trade
+objects with ``price``/``quantity``).  With ``Trader(tape=True)`` each
+strategy gets its product's ``TradeFeatures`` as ``self.tape``; it is off by
+default because no strategy reads it yet and it is per-tick work.
+"""
+import math
+
+import numpy as np
+
+# size buckets: bucket k counts trades of size in [2**(k-1), 2**k), the last one everything larger
+BUCKETS = 16
+BULK = 64
+
+
+class TradeFeatures:
+    def __init__(self, window=100):
+        self.window = window
+        self.ticks = 0
+        self._notional = [0.0] * window
+        self._volume = [0] * window
+        self._signed = [0] * window
+        self._count = [0] * window
+        self._sizes = [None] * window
+        self.notional = 0.0
+        self.volume = 0
+        self.signed_volume = 0
+        self.count = 0
+        self.size_counts = [0] * BUCKETS
+        self.last_price = None
+        self._mid = None
+        self._since_resync = 0
+
+    def update(self, trades, book=None):
+        """Slide the window by one tick and add this tick's ``(price, quantity)`` trades."""
+        i = self.ticks % self.window
+        self.ticks += 1
+        if self._count[i]:
+            self._expire(i)
+        if trades:
+            if len(trades) >= BULK:
+                self._add_bulk(i, trades)
+            else:
+                self._add(i, trades)
+        if book is not None and book.mid is not None:
+            self._mid = book.mid
+        self._since_resync += 1
+        if self._since_resync >= self.window:
+            self._resync()
+
+    def _expire(self, i):
+        self.notional -= self._notional[i]
+        self.volume -= self._volume[i]
+        self.signed_volume -= self._signed[i]
+        self.count -= self._count[i]
+        size_counts = self.size_counts
+        for bucket, n in self._sizes[i].items():
+            size_counts[bucket] -= n
+        self._notional[i] = 0.0
+        self._volume[i] = self._signed[i] = self._count[i] = 0
+        self._sizes[i] = None
+
+    def _add(self, i, trades):
+        mid = self._mid
+        last = self.last_price
+        notional = 0.0
+        volume = signed = 0
+        sizes = {}
+        for price, quantity in trades:
+            quantity = abs(quantity)
+            notional += price * quantity
+            volume += quantity
+            if mid is not None and price != mid:
+                sign = 1 if price > mid else -1
+            elif last is not None and price != last:
+                sign = 1 if price > last else -1
+            else:
+                sign = 0
+            signed += sign * quantity
+            bucket = min(int(quantity).bit_length(), BUCKETS - 1)
+            sizes[bucket] = sizes.get(bucket, 0) + 1
+            last = price
+        self.last_price = last
+        self._store(i, notional, volume, signed, len(trades), sizes)
+
+    def _add_bulk(self, i, trades):
+        price, quantity = zip(*trades)
+        price = np.array(price, dtype=np.float64)
+        quantity = np.abs(np.array(quantity, dtype=np.float64))
+        previous = np.empty_like(price)
+        previous[0] = price[0] if self.last_price is None else self.last_price
+        previous[1:] = price[:-1]
+        sign = np.sign(price - previous)
+        if self._mid is not None:
+            quote = np.sign(price - self._mid)
+            sign = np.where(quote != 0, quote, sign)
+        buckets = np.minimum(np.frexp(quantity)[1], BUCKETS - 1)
+        counts = np.bincount(buckets, minlength=BUCKETS)
+        sizes = {bucket: n for bucket, n in enumerate(counts.tolist()) if n}
+        self.last_price = trades[-1][0]
+        self._store(i, float(price @ quantity), int(quantity.sum()), int(sign @ quantity), len(trades), sizes)
+
+    def _store(self, i, notional, volume, signed, count, sizes):
+        self._notional[i] = notional
+        self._volume[i] = volume
+        self._signed[i] = signed
+        self._count[i] = count
+        self._sizes[i] = sizes
+        self.notional += notional
+        self.volume += volume
+        self.signed_volume += signed
+        self.count += count
+        size_counts = self.size_counts
+        for bucket, n in sizes.items():
+            size_counts[bucket] += n
+
+    def _resync(self):
+        self.notional = math.fsum(self._notional)
+        self.volume = sum(self._volume)
+        self.signed_volume = sum(self._signed)
+        self.count = sum(self._count)
+        self._since_resync = 0
+
+    @property
+    def vwap(self):
+        return self.notional / self.volume if self.volume else math.nan
+
+    @property
+    def imbalance(self):
+        """Signed volume over volume: +1 all buyer-initiated, -1 all seller-initiated."""
+        return self.signed_volume / self.volume if self.volume else 0.0
+
+    @property
+    def intensity(self):
+        """Trades per tick over the window."""
+        ticks = min(self.ticks, self.window)
+        return self.count / ticks if ticks else 0.0
+
+    @property
+    def mean_size(self):
+        return self.volume / self.count if self.count else 0.0
+
+    def size_quantile(self, q):
+        """Upper bound of the size bucket holding the ``q`` quantile of trade sizes (0 if no trades)."""
+        if not self.count:
+            return 0
+        target = q * self.count
+        seen = 0
+        for bucket, n in enumerate(self.size_counts):
+            seen += n
+            if n and seen >= target:
+                return 2 ** bucket - 1
+        return 2 ** (BUCKETS - 1) - 1
+
+
+def _pairs(trades):
+    if trades and not isinstance(trades[0], tuple):
+        return [(trade.price, trade.quantity) for trade in trades]
+    return trades
+
+
+class TapeEngine:
+    def __init__(self, products, window=100):
+        self.features = {product: TradeFeatures(window) for product in products}
+
+    def update(self, trades, books):
+        """One tick: ``trades`` is ``{product: trades}``, ``books`` this tick's ``{product: BookView}``."""
+        for product, features in self.features.items():
+            features.update(_pairs(trades.get(product)), books.get(product))
@@ -0,0 +1,205 @@
+"""Columnar binary store for the recorded price and trade files.
+
+Each product's CSV is converted once into one ``.npy`` file per column plus a
+``meta.json`` describing the source file.  Later loads memory-map the columns,
+so opening all eight products costs a few file opens, not a CSV parse, and
+concurrent sweep workers share the same pages in the OS cache.  A store entry
+is rebuilt automatically when its source CSV changes.
+
+Entries live under ``<product>/<kind>/<digest of the source path>``, so two
+data directories never overwrite each other's columns.  Every file of an
+entry is written to a temporary name and moved into place with
+``os.replace``: a process that has the old column memory-mapped keeps
+reading the old file, and no reader ever sees a half-written one.
+
+    python -m tradebotx.tickstore            # convert every product up front
+"""
+import glob
+import hashlib
+import json
+import os
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_DIR = os.path.join(ROOT, "AlgoTradingBacktester", "data")
+STORE_DIR = os.path.join(ROOT, ".tickstore")
+PRODUCTS = ("ABRA", "ASH", "DROWZEE", "JOLTEON", "LUXRAY", "MISTY", "SHINX", "SUDOWOODO")
+LEVELS = 3
+BOOK_COLUMNS = ("timestamp",) + tuple(
+    f"{side}_{field}_{level}"
+    for side in ("bid", "ask") for field in ("price", "volume") for level in range(1, LEVELS + 1)
+)
+
+
+def find_data_file(product, kind="price", data_dir=DATA_DIR):
+    """Path of a product's ``kind`` ("price" or "trade") CSV; file names vary per product.
+
+    The product's own directory is searched first, then the data root, where
+    some trade tapes sit as ``<product>_trades.csv``.
+    """
+    matches = sorted(
+        path for path in glob.glob(os.path.join(data_dir, product, "*.csv"))
+        if kind in os.path.basename(path).lower()
+    )
+    if not matches:
+        matches = sorted(
+            path for path in glob.glob(os.path.join(data_dir, "*.csv"))
+            if os.path.basename(path).lower().startswith(product.lower())
+            and kind in os.path.basename(path).lower()
+        )
+    if not matches:
+        raise FileNotFoundError(f"no {kind} file for {product} in {data_dir}")
+    return matches[0]
+
+
+def _source_meta(path):
+    stat = os.stat(path)
+    return {"source": os.path.abspath(path), "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+def _entry_dir(product, kind, store_dir, source):
+    digest = hashlib.sha256(os.path.abspath(source).encode()).hexdigest()[:16]
+    return os.path.join(store_dir, product, kind, digest)
+
+
+def _replace(path, write):
+    """Write ``path`` through ``write(file)`` on a temporary file, then move it into place."""
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        write(f)
+    os.replace(tmp, path)
+
+
+def convert(product, kind="price", data_dir=DATA_DIR, store_dir=STORE_DIR):
+    """Parse one CSV and write it as typed per-column ``.npy`` files."""
+    import pandas as pd
+
+    source = find_data_file(product, kind, data_dir)
+    frame = pd.read_csv(source)
+    if kind == "price":
+        names = BOOK_COLUMNS
+    else:
+        names = [c for c in frame.columns if pd.api.types.is_numeric_dtype(frame[c])]
+    entry = _entry_dir(product, kind, store_dir, source)
+    os.makedirs(entry, exist_ok=True)
+    dtypes = {}
+    for name in names:
+        if name not in frame:
+            values = np.full(len(frame), np.nan)
+        elif name == "timestamp":
+            values = frame[name].to_numpy(dtype=np.int64)
+        else:
+            values = frame[name].to_numpy(dtype=np.float64)
+        _replace(os.path.join(entry, name + ".npy"), lambda f: np.save(f, values))
+        dtypes[name] = values.dtype.str
+    meta = dict(_source_meta(source), rows=len(frame), columns=dtypes)
+    # meta.json goes last: an entry whose meta matches its source has all its columns
+    _replace(os.path.join(entry, "meta.json"), lambda f: f.write(json.dumps(meta, indent=1).encode()))
+    return meta
+
+
+def _is_fresh(entry, source):
+    try:
+        with open(os.path.join(entry, "meta.json")) as f:
+            meta = json.load(f)
+        current = _source_meta(source)
+    except (FileNotFoundError, ValueError):
+        return False
+    return all(meta.get(k) == v for k, v in current.items())
+
+
+class TickTable:
+    """Memory-mapped columns of one file with a timestamp index.
+
+    Columns are read-only ``np.memmap`` arrays; slicing them (``rows`` or
+    ``between``) returns views, never copies.
+    """
+
+    def __init__(self, columns):
+        self.columns = columns
+        self.timestamp = columns["timestamp"]
+
+    def __len__(self):
+        return len(self.timestamp)
+
+    def __getitem__(self, name):
+        return self.columns[name]
+
+    def __contains__(self, name):
+        return name in self.columns
+
+    def __iter__(self):
+        return iter(self.columns)
+
+    def keys(self):
+        return self.columns.keys()
+
+    def items(self):
+        return self.columns.items()
+
+    def values(self):
+        return self.columns.values()
+
+    def row_at(self, timestamp):
+        """Index of the last row at or before ``timestamp`` (-1 if none)."""
+        return int(np.searchsorted(self.timestamp, timestamp, side="right")) - 1
+
+    def rows(self, rows):
+        return TickTable({name: values[rows] for name, values in self.columns.items()})
+
+    def between(self, start, stop):
+        """Rows with ``start <= timestamp < stop``."""
+        lo, hi = np.searchsorted(self.timestamp, [start, stop])
+        return self.rows(slice(int(lo), int(hi)))
+
+
+def load(product, kind="price", data_dir=DATA_DIR, store_dir=STORE_DIR):
+    """Memory-mapped ``TickTable`` for a product, converting its CSV on first use."""
+    source = find_data_file(product, kind, data_dir)
+    entry = _entry_dir(product, kind, store_dir, source)
+    if not _is_fresh(entry, source):
+        convert(product, kind, data_dir, store_dir)
+    with open(os.path.join(entry, "meta.json")) as f:
+        meta = json.load(f)
+    return TickTable({
+        name: np.load(os.path.join(entry, name + ".npy"), mmap_mode="r")
+        for name in meta["columns"]
+    })
+
+
+def load_prices(product, data_dir=DATA_DIR, store_dir=STORE_DIR):
+    return load(product, "price", data_dir, store_dir)
+
+
+def load_trades(product, data_dir=DATA_DIR, store_dir=STORE_DIR):
+    return load(product, "trade", data_dir, store_dir)
+
+
+def load_all(products=PRODUCTS, data_dir=DATA_DIR, store_dir=STORE_DIR):
+    return {product: load_prices(product, data_dir, store_dir) for product in products}
+
+
+def main(argv=None):
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description="Convert price/trade CSVs into the tick store")
+    parser.add_argument("products", nargs="*", default=list(PRODUCTS))
+    parser.add_argument("--data-dir", default=DATA_DIR)
+    parser.add_argument("--store-dir", default=STORE_DIR)
+    args = parser.parse_args(argv)
+
+    for product in args.products:
+        for kind in ("price", "trade"):
+            start = time.perf_counter()
+            try:
+                meta = convert(product, kind, args.data_dir, args.store_dir)
+            except FileNotFoundError as exc:
+                print(f"{product:>10} {kind:>5}: skipped ({exc})")
+                continue
+            print(f"{product:>10} {kind:>5}: {meta['rows']} rows in {time.perf_counter() - start:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,208 @@
+"""Many traders over one replay of the data.
+
+Comparing strategy variants (the Week-3 ``drowzee_strategy_1.py`` against
+``drowzee_strategy(Final).py``, or parameter variants of a ``BaseClass``
+strategy) with ``Backtester`` decodes the tick store into books once per
+variant.  ``VariantBacktester`` decodes it once and, on every tick, hands
+each variant its own copy of the books (fills consume book volume) and its
+own positions, so ten variants cost one decode plus ten strategy
+evaluations.
+
+Both trader interfaces in the repo are supported:
+
+* multi-product, ``run(state)`` with ``state.order_depth`` a
+  ``{product: book}`` dict (``Strategy_24B2184.Trader``, ``StrategyTrader``),
+* single-product, ``run(state, position)`` with ``state.order_depth`` the
+  product's book, returning ``{"PRODUCT": orders}`` (the Week-3 traders).
+  Its orders are booked to the variant's ``product``.
+
+    python -m tradebotx.variants DROWZEE "../Week-3/strategies/drowzee_strategy_1.py" \\
+        "../Week-3/strategies/drowzee_strategy(Final).py" Strategy_24B2184.py
+"""
+import importlib.util
+import inspect
+import math
+import os
+import re
+import sys
+
+import numpy as np
+
+from tradebotx.backtest import Backtester, BacktestResult, State, _match, level_dicts
+from tradebotx.book import BookView
+from tradebotx.tickstore import DATA_DIR, ROOT, load_all
+
+
+class Variant:
+    """One trader in a comparison.
+
+    ``product`` is required for single-product traders and restricts a
+    multi-product trader's books to that product.  ``limit`` defaults to the
+    trader's ``max_position`` (or its strategies' limits).
+    """
+
+    def __init__(self, name, trader, product=None, limit=None):
+        self.name = name
+        self.trader = trader
+        self.product = product
+        self.single = _is_single_product(trader)
+        if self.single and product is None:
+            raise ValueError(f"{name}: single-product traders need a product")
+        strategies = getattr(trader, "strategies", {})
+        self.limits = {p: s.max_position for p, s in strategies.items()}
+        if product is not None and limit is None:
+            limit = self.limits.get(product, getattr(trader, "max_position", None))
+        if product is not None and limit is not None:
+            self.limits[product] = limit
+
+
+def _is_single_product(trader):
+    """``run(state, position)`` rather than ``run(state)``."""
+    return len(inspect.signature(trader.run).parameters) >= 2
+
+
+def load_trader(path, name="Trader"):
+    """Instantiate class ``name`` from a trader file (file names may contain parentheses).
+
+    The Week-3 files import ``src.backtester``, so the backtester checkout is
+    put on ``sys.path`` for them.
+    """
+    backtester = os.path.join(ROOT, "AlgoTradingBacktester")
+    if os.path.isdir(backtester) and backtester not in sys.path:
+        sys.path.append(backtester)
+    module_name = "variant_" + re.sub(r"\W", "_", os.path.splitext(os.path.basename(path))[0])
+    spec = importlib.util.spec_from_file_location(module_name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return getattr(module, name)()
+
+
+class VariantBacktester(Backtester):
+    """``Backtester`` for several variants at once; ``run`` returns ``{name: BacktestResult}``."""
+
+    def __init__(self, variants, data):
+        super().__init__(None, data)
+        names = [variant.name for variant in variants]
+        if len(set(names)) != len(names):
+            raise ValueError("variant names must be unique")
+        self.variants = list(variants)
+
+    def run(self):
+        timestamps, rows = self._timeline()
+        products = list(self.data)
+        books = {}
+        mids = {}
+        for product in products:
+            cols = self.data[product]
+            books[product] = (level_dicts(cols, "bid"), level_dicts(cols, "ask"))
+            mids[product] = ((cols["bid_price_1"] + cols["ask_price_1"]) / 2).tolist()
+
+        runs = []
+        for variant in self.variants:
+            shown = [variant.product] if variant.product is not None else products
+            shown = [p for p in shown if p in self.data]
+            runs.append(_Run(variant, shown, len(timestamps)))
+
+        last_mid = {}
+        for t, timestamp in enumerate(timestamps.tolist()):
+            levels = {}
+            for product in products:
+                row = rows[product][t]
+                if row < 0:
+                    continue
+                levels[product] = (books[product][0][row], books[product][1][row])
+                if not math.isnan(mids[product][row]):
+                    last_mid[product] = mids[product][row]
+            for run in runs:
+                run.tick(t, timestamp, levels, last_mid)
+
+        return {run.variant.name: run.result(timestamps) for run in runs}
+
+
+class _Run:
+    """Positions, cash and fills of one variant."""
+
+    def __init__(self, variant, products, n_ticks):
+        self.variant = variant
+        self.products = products
+        self.positions = {product: 0 for product in products}
+        self.cash = 0.0
+        self.turnover = 0
+        self.fills = 0
+        self.pnl_curve = np.empty(n_ticks)
+
+    def tick(self, t, timestamp, levels, last_mid):
+        variant = self.variant
+        order_depth = {}
+        for product in self.products:
+            if product in levels:
+                bids, asks = levels[product]
+                order_depth[product] = BookView.from_sorted(dict(bids), dict(asks))
+
+        if variant.single:
+            book = order_depth.get(variant.product)
+            if book is None:
+                result = {}
+            else:
+                position = self.positions[variant.product]
+                state = State(timestamp, book, {variant.product: position})
+                output = variant.trader.run(state, position)
+                output = output[0] if isinstance(output, tuple) else output
+                result = {variant.product: [order for orders in output.values() for order in orders]}
+        elif order_depth:
+            output = variant.trader.run(State(timestamp, order_depth, dict(self.positions)))
+            result = output[0] if isinstance(output, tuple) else output
+        else:
+            result = {}
+
+        for product, orders in result.items():
+            book = order_depth.get(product)
+            if book is None:
+                continue
+            limit = variant.limits.get(product, math.inf)
+            for order in orders:
+                filled, notional = _match(order, book, self.positions[product], limit)
+                if filled:
+                    self.positions[product] += filled
+                    self.cash -= notional
+                    self.turnover += abs(filled)
+                    self.fills += 1
+
+        self.pnl_curve[t] = self.cash + sum(pos * last_mid.get(p, 0.0) for p, pos in self.positions.items())
+
+    def result(self, timestamps):
+        return BacktestResult(timestamps, self.pnl_curve, self.positions, self.cash, self.turnover, self.fills)
+
+
+def main(argv=None):
+    import argparse
+    import time
+
+    from tradebotx.backtest import StrategyTrader
+
+    parser = argparse.ArgumentParser(description="Backtest several trader files over one replay")
+    parser.add_argument("product", help="product the single-product traders trade")
+    parser.add_argument("traders", nargs="+", help="trader files; multi-product ones run only PRODUCT")
+    parser.add_argument("--data-dir", default=DATA_DIR)
+    args = parser.parse_args(argv)
+
+    variants = []
+    for path in args.traders:
+        trader = load_trader(path)
+        if not _is_single_product(trader):
+            trader = StrategyTrader(trader.strategies[args.product])
+        variants.append(Variant(os.path.basename(path), trader, args.product))
+
+    data = load_all([args.product], args.data_dir)
+    start = time.perf_counter()
+    results = VariantBacktester(variants, data).run()
+    elapsed = time.perf_counter() - start
+    print(f"{len(variants)} variants x {len(next(iter(results.values())).timestamps)} ticks in {elapsed:.2f}s")
+    print(f"{'pnl':>12} {'max_drawdown':>12} {'turnover':>8} {'fills':>6}  variant")
+    for name, result in sorted(results.items(), key=lambda item: item[1].pnl, reverse=True):
+        s = result.summary()
+        print(f"{s['pnl']:>12.1f} {s['max_drawdown']:>12.1f} {s['turnover']:>8} {s['fills']:>6}  {name}")
+
+
+if __name__ == "__main__":
+    main()
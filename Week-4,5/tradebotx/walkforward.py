@@ -0,0 +1,212 @@
+"""Walk-forward validation with on-disk memoized backtests.
+
+The price history is cut into rolling train/test folds.  On each train window
+every candidate parameter set is backtested and the best one (by PnL) is then
+scored on the following test window.  A strategy whose chosen parameters jump
+around between folds, or whose test PnL collapses relative to train PnL, is
+overfit.
+
+Backtest results are cached on disk, keyed by a hash of the fold's data, the
+source of the strategy class (and its bases), the source of every
+``tradebotx`` module its file and the backtester import (directly or not) and
+the parameters, so rerunning after a change only recomputes the folds that
+change actually affects.
+
+    python -m tradebotx.walkforward AbraStrategy --grid z_threshold=1.5,2,2.5 --train 5000 --test 1000
+"""
+import hashlib
+import importlib.util
+import inspect
+import json
+import os
+import re
+import statistics
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+from tradebotx.sweep import grid, params_key, parse_value, run_one
+from tradebotx.tickstore import DATA_DIR, load_prices
+
+CACHE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".backtest_cache")
+
+_IMPORT = re.compile(r"^\s*(?:from|import)\s+(tradebotx(?:\.\w+)*)", re.MULTILINE)
+
+
+def folds(n_rows, train, test, step=None):
+    """``(train, test)`` row slices of consecutive rolling windows."""
+    step = step or test
+    out = []
+    start = 0
+    while start + train + test <= n_rows:
+        out.append((slice(start, start + train), slice(start + train, start + train + test)))
+        start += step
+    return out
+
+
+def data_hash(columns):
+    digest = hashlib.sha256()
+    for name in sorted(columns):
+        digest.update(name.encode())
+        digest.update(columns[name].tobytes())
+    return digest.hexdigest()
+
+
+def module_sources(names):
+    """``{module: source}`` of the ``tradebotx`` modules ``names`` and everything they import from it."""
+    sources = {}
+    todo = list(names)
+    while todo:
+        name = todo.pop()
+        if name in sources:
+            continue
+        spec = importlib.util.find_spec(name)
+        if spec is None or not spec.origin or not spec.origin.endswith(".py"):
+            continue
+        with open(spec.origin) as f:
+            sources[name] = f.read()
+        todo.extend(_IMPORT.findall(sources[name]))
+    return sources
+
+
+def strategy_hash(strategy_cls):
+    digest = hashlib.sha256()
+    for cls in strategy_cls.__mro__:
+        if cls is object:
+            continue
+        digest.update(inspect.getsource(cls).encode())
+    # the library code the run executes: what the strategy's file imports, and the backtester
+    imports = _IMPORT.findall(inspect.getsource(sys.modules[strategy_cls.__module__]))
+    for name, source in sorted(module_sources(imports + ["tradebotx.sweep"]).items()):
+        digest.update(name.encode())
+        digest.update(source.encode())
+    return digest.hexdigest()
+
+
+class BacktestCache:
+    """One JSON file per (data, strategy source, params) key."""
+
+    def __init__(self, path=CACHE_DIR):
+        self.path = path
+
+    def key(self, data_digest, strategy_digest, params):
+        raw = "|".join((data_digest, strategy_digest, params_key(params)))
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    def _file(self, key):
+        return os.path.join(self.path, key[:2], key + ".json")
+
+    def get(self, key):
+        try:
+            with open(self._file(key)) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def put(self, key, row):
+        path = self._file(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(row, f)
+        os.replace(tmp, path)
+
+
+def _slice(columns, rows):
+    return {name: values[rows] for name, values in columns.items()}
+
+
+def _evaluate(pool, cache, strategy_cls, product, strategy_digest, columns, param_sets):
+    """Result rows for every parameter set on ``columns``, from cache where possible."""
+    digest = data_hash(columns)
+    rows = [None] * len(param_sets)
+    pending = {}
+    for i, params in enumerate(param_sets):
+        key = cache.key(digest, strategy_digest, params)
+        rows[i] = cache.get(key)
+        if rows[i] is None:
+            pending[i] = (key, pool.submit(run_one, strategy_cls, product, params, columns))
+    for i, (key, future) in pending.items():
+        rows[i] = future.result()
+        cache.put(key, rows[i])
+    return rows
+
+
+def walk_forward(strategy_cls, param_sets, train, test, step=None, product=None,
+                 data_dir=DATA_DIR, cache_dir=CACHE_DIR, workers=None):
+    """Optimize on each train window, score on the next test window.
+
+    Returns ``(fold_rows, report)``: one row per fold with the chosen parameters
+    and their train/test PnL, plus a stability summary across folds.
+    """
+    product = product or strategy_cls().product_name
+    columns = load_prices(product, data_dir)
+    cache = BacktestCache(cache_dir)
+    strategy_digest = strategy_hash(strategy_cls)
+    fold_rows = []
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+        for n, (train_rows, test_rows) in enumerate(folds(len(columns["timestamp"]), train, test, step)):
+            results = _evaluate(pool, cache, strategy_cls, product, strategy_digest,
+                                _slice(columns, train_rows), param_sets)
+            best = max(range(len(param_sets)), key=lambda i: results[i]["pnl"])
+            scored = _evaluate(pool, cache, strategy_cls, product, strategy_digest,
+                               _slice(columns, test_rows), [param_sets[best]])[0]
+            fold_rows.append({
+                "fold": n,
+                "train_start": train_rows.start,
+                "test_start": test_rows.start,
+                "params": params_key(param_sets[best]),
+                "train_pnl": results[best]["pnl"],
+                "test_pnl": scored["pnl"],
+                "test_max_drawdown": scored["max_drawdown"],
+            })
+    return fold_rows, stability_report(fold_rows)
+
+
+def stability_report(fold_rows):
+    if not fold_rows:
+        return {}
+    test = [row["test_pnl"] for row in fold_rows]
+    train = [row["train_pnl"] for row in fold_rows]
+    chosen = [row["params"] for row in fold_rows]
+    most_common = max(set(chosen), key=chosen.count)
+    return {
+        "folds": len(fold_rows),
+        "distinct_params": len(set(chosen)),
+        "most_common_params": most_common,
+        "most_common_share": chosen.count(most_common) / len(chosen),
+        "train_pnl_mean": statistics.mean(train),
+        "test_pnl_mean": statistics.mean(test),
+        "test_pnl_std": statistics.stdev(test) if len(test) > 1 else 0.0,
+        "test_positive_share": sum(p > 0 for p in test) / len(test),
+    }
+
+
+def main(argv=None):
+    import argparse
+    import importlib
+
+    parser = argparse.ArgumentParser(description="Walk-forward validation")
+    parser.add_argument("strategy", help="strategy class name in Strategy_24B2184")
+    parser.add_argument("--grid", nargs="*", default=[], metavar="NAME=V1,V2,...")
+    parser.add_argument("--train", type=int, required=True, help="rows per train window")
+    parser.add_argument("--test", type=int, required=True, help="rows per test window")
+    parser.add_argument("--step", type=int)
+    parser.add_argument("--product")
+    parser.add_argument("--data-dir", default=DATA_DIR)
+    parser.add_argument("--cache-dir", default=CACHE_DIR)
+    parser.add_argument("--workers", type=int)
+    args = parser.parse_args(argv)
+
+    strategy_cls = getattr(importlib.import_module("Strategy_24B2184"), args.strategy)
+    param_sets = grid(**{name: [parse_value(v) for v in spec.split(",")]
+                         for name, spec in (item.split("=", 1) for item in args.grid)})
+    fold_rows, report = walk_forward(strategy_cls, param_sets, args.train, args.test, args.step,
+                                     args.product, args.data_dir, args.cache_dir, args.workers)
+    for row in fold_rows:
+        print(f"fold {row['fold']:>3}  train {row['train_pnl']:>10.1f}  test {row['test_pnl']:>10.1f}  {row['params']}")
+    for key, value in report.items():
+        print(f"{key:>20}: {value}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,269 @@
+"""Startup warm-up of the strategies' rolling state from recorded prices.
+
+Without it every strategy market-makes blind until ``lookback`` live ticks
+have filled its windows.  ``warm_up`` reads the last ``ticks`` rows of each
+product's price file from the memory-mapped tick store (one slice per
+column, no CSV parse) and puts every indicator directly into the state it
+would have after seeing those mids:
+
+* ``RollingStats`` and ``RSI`` get their ring buffers from the tail of the
+  array,
+* ``EMA`` accumulators are one dot product with the decay weights, and
+  ``MACD`` signal lines come from ``macd_lines``; a
+  ``WindowedMACD`` only needs its last ``window`` prices,
+* the ``PriceHistory`` is written with one fancy-indexed assignment.
+
+None of this loops over ticks in Python, so a product costs well under a
+millisecond once its columns are cached.  The basket and pairs engines have
+no closed form and are fed the tails one tick at a time, last: each
+``BasketEngine`` gets the top of book of its index and legs on every
+timestamp of their tails, as ``Trader.run`` would have passed it, and the
+pairs get their aligned mids.
+
+``budget`` (seconds) is checked before each product: whatever is not primed
+when it runs out simply warms up on live ticks as before, so going live is
+never delayed by more than one product's load.  Run
+``python -m tradebotx.tickstore`` beforehand so no CSV conversion lands in
+the budget.
+
+    trader = Trader()
+    trader.warm_up(budget=0.5)
+"""
+import math
+import time
+
+import numpy as np
+
+from tradebotx.backtest import mids_for_indicators
+from tradebotx.indicators import EMA, MACD, RSI, RollingStats, WindowedMACD
+from tradebotx.pairs import aligned_mids
+from tradebotx.tickstore import DATA_DIR, load_prices
+
+# enough for every lookback and for (1 - alpha) ** ticks of the slowest EMA to vanish
+WARMUP_TICKS = 1000
+
+
+def linear_filter(x, beta, gain=1.0, init=0.0):
+    """``y[i] = beta * y[i - 1] + gain * x[i]`` with ``y[-1] = init``, without a Python loop.
+
+    The recursion is solved in chunks with cumulative sums of ``x * beta**-k``;
+    chunks are short enough that ``beta**-k`` stays far from overflow.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.empty_like(x)
+    if beta == 0:
+        np.multiply(x, gain, out=y)
+        return y
+    chunk = max(1, int(150 * math.log(10) / -math.log(beta))) if beta < 1 else len(x) or 1
+    carry = init
+    for start in range(0, len(x), chunk):
+        seg = x[start:start + chunk]
+        k = np.arange(len(seg), dtype=np.float64)
+        powers = beta ** k
+        y_seg = powers * np.cumsum(gain * seg / powers) + carry * beta * powers
+        y[start:start + len(seg)] = y_seg
+        carry = y_seg[-1]
+    return y
+
+
+def ewm_mean(x, span):
+    """``pd.Series(x).ewm(span=span).mean()`` (``adjust=True``)."""
+    beta = 1 - 2 / (span + 1)
+    num = linear_filter(x, beta)
+    den = (1 - beta ** np.arange(1, len(num) + 1)) / (1 - beta)
+    return num / den
+
+
+def macd_lines(x, fast=12, slow=26, signal=9):
+    macd = ewm_mean(x, fast) - ewm_mean(x, slow)
+    return macd, ewm_mean(macd, signal)
+
+
+def rsi_averages(x, period=14, method="sma"):
+    """Average gain and loss after each price; NaN until ``period`` changes are seen."""
+    x = np.asarray(x, dtype=np.float64)
+    avg_gain = np.full(len(x), np.nan)
+    avg_loss = np.full(len(x), np.nan)
+    if len(x) <= period:
+        return avg_gain, avg_loss
+    delta = np.diff(x)
+    gains = np.where(delta > 0, delta, 0.0)
+    losses = np.where(delta < 0, -delta, 0.0)
+    if method == "sma":
+        g = np.concatenate(([0.0], np.cumsum(gains)))
+        l = np.concatenate(([0.0], np.cumsum(losses)))
+        avg_gain[period:] = (g[period:] - g[:-period]) / period
+        avg_loss[period:] = (l[period:] - l[:-period]) / period
+    else:
+        beta = (period - 1) / period
+        seed_gain = gains[:period].mean()
+        seed_loss = losses[:period].mean()
+        avg_gain[period] = seed_gain
+        avg_loss[period] = seed_loss
+        avg_gain[period + 1:] = linear_filter(gains[period:], beta, 1 / period, seed_gain)
+        avg_loss[period + 1:] = linear_filter(losses[period:], beta, 1 / period, seed_loss)
+    return avg_gain, avg_loss
+
+
+def load_tail(product, ticks=WARMUP_TICKS, data_dir=DATA_DIR, before=None):
+    """The last ``ticks`` price rows of ``product`` (before timestamp ``before`` if given)."""
+    table = load_prices(product, data_dir)
+    end = len(table) if before is None else int(np.searchsorted(table["timestamp"], before))
+    return table.rows(slice(max(end - ticks, 0), end))
+
+
+def _ring(values, size):
+    """Ring buffer (as a list) and next index after appending ``values`` to an empty one."""
+    n = len(values)
+    buf = np.zeros(size)
+    m = min(n, size)
+    buf[np.arange(n - m, n) % size] = values[n - m:]
+    return buf.tolist(), n % size
+
+
+def prime_stats(stats, mids):
+    if not len(mids):
+        return
+    stats._buf, stats._idx = _ring(mids, stats.window)
+    stats.count = len(mids)
+    stats._resync()
+
+
+def prime_ema(ema, values):
+    n = len(values)
+    if not n:
+        return
+    weights = ema._beta ** np.arange(n - 1, -1, -1, dtype=np.float64)
+    ema._num = float(weights @ values)
+    ema._den = float(weights.sum())
+    ema.count = n
+
+
+def prime_macd(macd, mids):
+    if not len(mids):
+        return
+    line, signal = macd_lines(mids, macd.fast.span, macd.slow.span, macd.signal_ema.span)
+    prime_ema(macd.fast, mids)
+    prime_ema(macd.slow, mids)
+    prime_ema(macd.signal_ema, line)
+    macd.macd, macd.signal = float(line[-1]), float(signal[-1])
+    if len(mids) > 1:
+        macd.prev_macd, macd.prev_signal = float(line[-2]), float(signal[-2])
+
+
+def prime_windowed_macd(macd, mids):
+    macd._prices.clear()
+    macd._prices.extend(mids[-macd.window:].tolist())
+    macd.count = len(mids)
+    macd._values = None
+
+
+def prime_rsi(rsi, mids):
+    if not len(mids):
+        return
+    delta = np.diff(mids)
+    gains = np.where(delta > 0, delta, 0.0)
+    losses = np.where(delta < 0, -delta, 0.0)
+    rsi._gains, rsi._idx = _ring(gains, rsi.period)
+    rsi._losses, _ = _ring(losses, rsi.period)
+    rsi._gain_sum = sum(rsi._gains)
+    rsi._loss_sum = sum(rsi._losses)
+    rsi._prev = float(mids[-1])
+    rsi.count = len(delta)
+    if rsi.count >= rsi.period:
+        if rsi.method == "wilder":
+            avg_gain, avg_loss = rsi_averages(mids, rsi.period, rsi.method)
+            rsi._avg_gain, rsi._avg_loss = float(avg_gain[-1]), float(avg_loss[-1])
+        else:
+            rsi._avg_gain = rsi._gain_sum / rsi.period
+            rsi._avg_loss = rsi._loss_sum / rsi.period
+
+
+def prime(indicator, mids):
+    """Put ``indicator`` in the state feeding it ``mids`` from fresh would leave it in."""
+    mids = np.asarray(mids, dtype=np.float64)
+    if isinstance(indicator, RollingStats):
+        prime_stats(indicator, mids)
+    elif isinstance(indicator, MACD):
+        prime_macd(indicator, mids)
+    elif isinstance(indicator, WindowedMACD):
+        prime_windowed_macd(indicator, mids)
+    elif isinstance(indicator, EMA):
+        prime_ema(indicator, mids)
+    elif isinstance(indicator, RSI):
+        prime_rsi(indicator, mids)
+    else:
+        raise TypeError(f"no warm-up for {type(indicator).__name__}")
+
+
+def prime_indicators(strategy, mids):
+    """Prime every streaming indicator attribute of a fresh ``strategy`` and its price history."""
+    strategy.prices.extend(mids)
+    for value in vars(strategy).values():
+        if isinstance(value, (RollingStats, EMA, MACD, WindowedMACD, RSI)):
+            prime(value, mids)
+
+
+class _Top:
+    """The part of a ``BookView`` a ``BasketEngine`` reads."""
+    __slots__ = ("best_bid", "best_ask", "mid")
+
+    def __init__(self, best_bid, best_ask):
+        self.best_bid = best_bid
+        self.best_ask = best_ask
+        self.mid = (best_ask + best_bid) / 2 if best_bid is not None and best_ask is not None else None
+
+
+def prime_basket(basket, tails):
+    """Feed ``basket`` the top of book of its index and legs on every timestamp of their ``tails``."""
+    products = [basket.index, *basket.weights]
+    if any(product not in tails for product in products):
+        return
+    timestamps = np.unique(np.concatenate([tails[product]["timestamp"] for product in products]))
+    columns = []
+    for product in products:
+        table = tails[product]
+        ts = table["timestamp"]
+        rows = np.minimum(np.searchsorted(ts, timestamps), len(ts) - 1)
+        hit = (ts[rows] == timestamps).tolist()
+        tops = []
+        for side in ("bid", "ask"):
+            prices = table[f"{side}_price_1"][rows]
+            valid = ~np.isnan(prices)
+            tops.append([int(p) if ok else None
+                         for p, ok in zip(np.where(valid, prices, 0).tolist(), valid.tolist())])
+        columns.append((product, hit, tops[0], tops[1]))
+    for t in range(len(timestamps)):
+        basket.update({product: _Top(bids[t], asks[t]) for product, hit, bids, asks in columns if hit[t]})
+
+
+def warm_up(strategies, pairs=None, ticks=WARMUP_TICKS, budget=0.5, data_dir=DATA_DIR, before=None,
+            baskets=()):
+    """Prime ``{product: strategy}`` (and ``baskets`` and a ``PairsEngine``) from the price files' tails.
+
+    Stops when ``budget`` seconds are used up; returns the products primed.
+    """
+    deadline = time.perf_counter() + budget
+    tails = {}
+    warmed = []
+    for product, strategy in strategies.items():
+        if time.perf_counter() >= deadline:
+            return warmed
+        try:
+            tails[product] = load_tail(product, ticks, data_dir, before)
+        except FileNotFoundError:
+            continue
+        strategy.warm_up(mids_for_indicators(tails[product]))
+        warmed.append(product)
+    for basket in baskets:
+        if time.perf_counter() >= deadline:
+            return warmed
+        prime_basket(basket, tails)
+    if pairs is not None:
+        for signal in pairs.signals:
+            if time.perf_counter() >= deadline:
+                break
+            if signal.y in tails and signal.x in tails:
+                for y, x in aligned_mids([tails[signal.y], tails[signal.x]]).tolist():
+                    signal.update(y, x)
+    return warmed